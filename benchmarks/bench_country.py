@@ -0,0 +1,49 @@
+#Copyright @ISmartCoder
+#Updates Channel t.me/TheSmartDev
+import argparse
+import random
+import time
+import pycountry
+from utils import COUNTRY_ALIASES, get_flag_emoji, get_country_emoji, build_country_index
+from utils import flags
+
+SAMPLE_NAMES = [
+    "Bangladesh", "India", "Nigeria", "Indonesia", "Kenya", "Pakistan", "Egypt", "Brazil", "USA", "UK", "UAE",
+    "Vietnam", "Russia", "Iran", "Bolivia", "Tanzania", "Venezuela", "Moldova", "Laos", "Syria", "Unknown", "Ivory",
+]
+
+def legacy_country_emoji(country_name):
+    country_name = COUNTRY_ALIASES.get(country_name, country_name)
+    try:
+        countries = pycountry.countries.search_fuzzy(country_name)
+    except LookupError:
+        return "🌍"
+    if countries:
+        return get_flag_emoji(countries[0].alpha_2)
+    return "🌍"
+
+def timed(fn, names):
+    started = time.perf_counter()
+    for name in names:
+        fn(name)
+    return time.perf_counter() - started
+
+def main():
+    parser = argparse.ArgumentParser(description="Country flag resolution: search_fuzzy per SMS vs precomputed index")
+    parser.add_argument("--lookups", type=int, default=2000)
+    args = parser.parse_args()
+
+    names = [random.choice(SAMPLE_NAMES) for _ in range(args.lookups)]
+    started = time.perf_counter()
+    build_country_index()
+    index_build = time.perf_counter() - started
+    legacy = timed(legacy_country_emoji, names)
+    indexed = timed(get_country_emoji, names)
+    mismatches = [name for name in SAMPLE_NAMES if legacy_country_emoji(name) != get_country_emoji(name)]
+    print(f"index build: {index_build * 1000:.1f} ms ({len(flags.country_index)} keys)")
+    print(f"search_fuzzy: {legacy / args.lookups * 1e6:>10.1f} us/lookup")
+    print(f"indexed:      {indexed / args.lookups * 1e6:>10.1f} us/lookup  ({flags.fuzzy_country_code.cache_info()})")
+    print(f"mismatches:   {mismatches or 'none'}")
+
+if __name__ == "__main__":
+    main()
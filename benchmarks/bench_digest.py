@@ -0,0 +1,111 @@
+#Copyright @ISmartCoder
+#Updates Channel t.me/TheSmartDev
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import tempfile
+import time
+from benchmarks.fake_telegram import FakeTelegramClient
+import modules.dispatcher as dispatcher_module
+import modules.scraper as scraper
+from modules.digest import DigestBuffer
+from utils import SubscriptionIndex, Outbox, SmsRecord, PENDING
+
+SERVICES = ("WhatsApp", "Telegram", "Facebook", "Google", "TikTok")
+COUNTRIES = (("Bangladesh", "🇧🇩"), ("Nigeria", "🇳🇬"), ("Pakistan", "🇵🇰"))
+
+def synthetic_traffic(bursts, burst_size, gap, seed=1):
+    rng = random.Random(seed)
+    events = []
+    for burst in range(bursts):
+        start = burst * gap
+        for index in range(burst_size):
+            country, emoji = rng.choice(COUNTRIES)
+            number = f"880{rng.randrange(10 ** 9):09d}"
+            otp = f"{rng.randrange(10 ** 6):06d}"
+            events.append((start + index * 0.05, {
+                "range": f"{country.upper()} {burst}", "count": burst_size, "country": country, "country_emoji": emoji,
+                "service": rng.choice(SERVICES), "number": number, "otp": otp,
+                "full_message": f"Your code is {otp}", "message_id": f"{number}_{burst}_{index}"
+            }))
+    return events
+
+def replayed_traffic(path, speed):
+    with open(path, 'r', encoding='utf-8') as f:
+        entries = [json.loads(line) for line in f if line.strip()]
+    start = min((sms.get('first_seen', 0) for sms in entries), default=0)
+    return [((sms.get('first_seen', start) - start) / speed, sms) for sms in entries]
+
+OTP_CODE = re.compile(r"(?:OTP Code :\*\* |➜ )`([^`]+)`")
+
+async def run(mode, events, args):
+    state_dir = tempfile.mkdtemp(prefix=f"bench-digest-{mode}-")
+    client = FakeTelegramClient(latency=args.send_latency, flood_rate=args.flood_rate)
+    chats = [-1000000000000 - i for i in range(args.chats)]
+    scraper.routes = SubscriptionIndex(os.path.join(state_dir, "subscriptions.json"), chats)
+    scraper.routes.load()
+    scraper.outbox = Outbox(os.path.join(state_dir, "outbox.db"))
+    scraper.dispatcher = dispatcher_module.Dispatcher(client, outbox=scraper.outbox)
+    scraper.digest = None
+    if mode == "digest":
+        scraper.digest = DigestBuffer(scraper.dispatcher, scraper.format_sms, scraper.format_digest, window=args.window)
+    scraper.dispatcher.start()
+
+    started = time.time()
+    for offset, sms in events:
+        delay = started + offset - time.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        sms = SmsRecord.from_dict(dict(sms, first_seen=time.time()))
+        scraper.send_sms_to_telegram(scraper.dispatcher, sms)
+    while scraper.outbox.counts().get(PENDING) and time.time() - started < args.timeout:
+        await asyncio.sleep(0.05)
+    drained = time.time() - started
+    await scraper.dispatcher.stop()
+    scraper.outbox.close()
+
+    delivered = sum(len(OTP_CODE.findall(message)) for _, _, message, _ in client.sent)
+    calls = sum(count for method, count in client.calls.items() if method != "flood_wait")
+    return {
+        "messages": len(client.sent),
+        "delivered": delivered,
+        "calls": calls,
+        "flood_waits": client.calls["flood_wait"],
+        "drained": drained
+    }
+
+async def main():
+    parser = argparse.ArgumentParser(description="Telegram API calls per delivered OTP under burst traffic, one message per OTP vs digest mode")
+    parser.add_argument("--bursts", type=int, default=3)
+    parser.add_argument("--burst-size", type=int, default=30)
+    parser.add_argument("--gap", type=float, default=10, help="seconds between bursts")
+    parser.add_argument("--replay", help="JSON lines of SMS entries (as printed by modules.worker) to replay instead")
+    parser.add_argument("--speed", type=float, default=1.0, help="replay speed-up factor")
+    parser.add_argument("--chats", type=int, default=2)
+    parser.add_argument("--window", type=float, default=2.0, help="digest window (s)")
+    parser.add_argument("--chat-rate", type=float, default=1.0, help="sends per second per group, Telegram allows 20/60")
+    parser.add_argument("--send-latency", type=float, default=0.02)
+    parser.add_argument("--flood-rate", type=float, default=0.0, help="fraction of sends answered with FloodWait")
+    parser.add_argument("--timeout", type=float, default=300)
+    args = parser.parse_args()
+
+    dispatcher_module.DELIVERY_GROUP_RATE = args.chat_rate
+    if args.replay:
+        events = replayed_traffic(args.replay, args.speed)
+    else:
+        events = synthetic_traffic(args.bursts, args.burst_size, args.gap)
+    expected = len(events) * args.chats
+    print(f"{len(events)} OTPs to {args.chats} chats ({expected} deliveries), group rate {args.chat_rate}/s, window {args.window} s")
+    for mode in ("single", "digest"):
+        result = await run(mode, events, args)
+        per_otp = result["calls"] / max(result["delivered"], 1)
+        print(
+            f"{mode:>7}: {result['delivered']}/{expected} delivered in {result['messages']} messages, "
+            f"{result['calls']} API calls ({per_otp:.2f}/OTP), {result['flood_waits']} FloodWaits, drained in {result['drained']:.1f} s"
+        )
+
+if __name__ == "__main__":
+    asyncio.run(main())
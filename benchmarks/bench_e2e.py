@@ -0,0 +1,81 @@
+#Copyright @ISmartCoder
+#Updates Channel t.me/TheSmartDev
+import argparse
+import asyncio
+import os
+import re
+import statistics
+import tempfile
+from benchmarks.portal_stub import PortalStub
+from benchmarks.fake_telegram import FakeTelegramClient
+import modules.scraper as scraper
+from utils import METRICS, SubscriptionIndex
+
+OTP_CODE = re.compile(r"OTP Code :\*\* `(\d+)`")
+
+def percentile(values, q):
+    if not values:
+        return 0.0
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[q - 1]
+
+def delivery_latencies(stub, client):
+    latencies = []
+    for sent_at, _, message, _ in client.sent:
+        match = OTP_CODE.search(message)
+        if match and match.group(1) in stub.arrivals:
+            latencies.append(sent_at - stub.arrivals[match.group(1)])
+    return latencies
+
+async def main():
+    parser = argparse.ArgumentParser(description="Drive run_sms_monitor end to end against the portal stub and a fake Telegram client")
+    parser.add_argument("--ranges", type=int, default=10)
+    parser.add_argument("--numbers", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.05, help="portal latency per request (s)")
+    parser.add_argument("--rate", type=float, default=0.5, help="new SMS per second")
+    parser.add_argument("--duration", type=float, default=60)
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="fraction of portal requests answered with 429")
+    parser.add_argument("--encoding", choices=["none", "gzip", "br"], default="none")
+    parser.add_argument("--recordings", help="directory of recorded portal pages to replay")
+    parser.add_argument("--chats", type=int, default=2)
+    parser.add_argument("--send-latency", type=float, default=0.02)
+    parser.add_argument("--flood-rate", type=float, default=0.0, help="fraction of sends answered with FloodWait")
+    args = parser.parse_args()
+
+    stub = PortalStub(
+        ranges=args.ranges, numbers=args.numbers, latency=args.latency, throttle_rate=args.throttle_rate,
+        encoding=None if args.encoding == "none" else args.encoding, recordings=args.recordings
+    )
+    await stub.start()
+    stub.patch_urls(scraper)
+    state_dir = tempfile.mkdtemp(prefix="bench-e2e-")
+    stub.isolate_state(scraper, state_dir)
+    client = FakeTelegramClient(latency=args.send_latency, flood_rate=args.flood_rate)
+    scraper.CHAT_IDS = [-1000000000000 - i for i in range(args.chats)]
+    scraper.routes = SubscriptionIndex(os.path.join(state_dir, "subscriptions.json"), scraper.CHAT_IDS)
+    scraper.ACCOUNTS = scraper.ACCOUNTS[:1]
+
+    scraper.setup_otp_handler(client)
+    stub.start_traffic(args.rate)
+    await asyncio.sleep(args.duration)
+
+    list_requests = stub.page_requests["list"] or 1
+    portal_requests = sum(stub.page_requests.values())
+    latencies = delivery_latencies(stub, client)
+    generated = len(stub.arrivals)
+    delivered = len({OTP_CODE.search(message).group(1) for _, _, message, _ in client.sent if OTP_CODE.search(message)})
+    print(f"duration:            {args.duration:.0f} s, {args.rate} SMS/s over {args.ranges}x{args.numbers} numbers")
+    print(f"cycles/s:            {list_requests / args.duration:.2f}")
+    print(f"requests/cycle:      {portal_requests / list_requests:.1f} ({portal_requests} portal requests, {stub.throttled} throttled)")
+    print(f"bytes on the wire:   {stub.bytes_sent}")
+    print(f"OTPs delivered:      {delivered}/{generated}")
+    print(f"telegram calls:      {dict(client.calls)}")
+    print(f"delivery latency:    p50 {percentile(latencies, 50):.2f} s, p95 {percentile(latencies, 95):.2f} s, max {max(latencies, default=0):.2f} s")
+    first_otp = METRICS.histograms.get(("time_to_first_otp_seconds", ()))
+    if first_otp:
+        print(f"time to first OTP:   p50 <= {first_otp.quantile(0.5)} s, p95 <= {first_otp.quantile(0.95)} s per cycle")
+    await stub.stop()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,58 @@
+#Copyright @ISmartCoder
+#Updates Channel t.me/TheSmartDev
+import argparse
+import asyncio
+import tempfile
+import time
+from benchmarks.portal_stub import PortalStub
+import modules.scraper as scraper
+from utils import PollState, HealthTracker, create_session, transport_stats
+
+async def measure(stub, concurrency, cycles, steady):
+    scraper.fetch_semaphore = asyncio.Semaphore(concurrency)
+    scraper.poll_state = PollState()
+    scraper.health = HealthTracker()
+    timings = []
+    async with create_session() as session:
+        for cycle in range(cycles):
+            if not steady or cycle == 0:
+                stub.add_messages_everywhere()
+            stub.requests = 0
+            connections, wire_bytes = transport_stats["connections"], transport_stats["wire_bytes"]
+            started = time.perf_counter()
+            sms_list = await scraper.collect_sms(session)
+            timings.append(time.perf_counter() - started)
+    return (
+        min(timings), sum(timings) / len(timings), stub.requests, len(sms_list),
+        transport_stats["connections"] - connections, transport_stats["wire_bytes"] - wire_bytes
+    )
+
+async def main():
+    parser = argparse.ArgumentParser(description="Poll cycle time versus fetch concurrency against a local portal stub")
+    parser.add_argument("--ranges", type=int, default=5)
+    parser.add_argument("--numbers", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--cycles", type=int, default=3)
+    parser.add_argument("--steady", action="store_true", help="no new traffic after the first cycle")
+    parser.add_argument("--encoding", choices=["none", "gzip", "br"], default="gzip")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32])
+    args = parser.parse_args()
+
+    stub = PortalStub(
+        ranges=args.ranges, numbers=args.numbers, latency=args.latency,
+        encoding=None if args.encoding == "none" else args.encoding
+    )
+    await stub.start()
+    stub.patch_urls(scraper)
+    stub.isolate_state(scraper, tempfile.mkdtemp(prefix="bench-fetch-"))
+    print(f"{args.ranges} ranges x {args.numbers} numbers, {args.latency * 1000:.0f} ms per request, {args.encoding} bodies")
+    print(f"{'concurrency':>11} {'best (s)':>10} {'mean (s)':>10} {'requests':>9} {'conns':>6} {'wire bytes':>11}")
+    try:
+        for concurrency in args.concurrency:
+            best, mean, requests, _, connections, wire_bytes = await measure(stub, concurrency, args.cycles, args.steady)
+            print(f"{concurrency:>11} {best:>10.3f} {mean:>10.3f} {requests:>9} {connections:>6} {wire_bytes:>11}")
+    finally:
+        await stub.stop()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,74 @@
+#Copyright @ISmartCoder
+#Updates Channel t.me/TheSmartDev
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from logging.handlers import RotatingFileHandler
+from utils import LOGGER, LoopLagMonitor, configure_logging, log_counts
+
+MODES = {
+    "sync": {"queued": False, "sampled": False, "mode": "full"},
+    "queue": {"queued": True, "sampled": False, "mode": "full"},
+    "sampled": {"queued": True, "sampled": True, "mode": "full"},
+    "counters": {"queued": True, "sampled": True, "mode": "counters"},
+}
+
+class SlowFileHandler(RotatingFileHandler):
+    def __init__(self, *args, io_delay=0.0, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.io_delay = io_delay
+
+    def emit(self, record):
+        if self.io_delay:
+            time.sleep(self.io_delay)
+        super().emit(record)
+
+async def error_storm(records, per_tick, sampled, numbers):
+    for i in range(records):
+        number = f"8801{i % numbers:08d}"
+        extra = {"sample_key": f"details_error:{number}"} if sampled else None
+        LOGGER.error(f"Error fetching SMS details for {number}: Too Many Requests (429)", extra=extra)
+        if i % per_tick == 0:
+            await asyncio.sleep(0)
+
+async def measure(name, directory, records, per_tick, max_bytes, fmt, io_delay, numbers):
+    options = MODES[name]
+    handler = SlowFileHandler(os.path.join(directory, f"{name}.log"), maxBytes=max_bytes, backupCount=3, io_delay=io_delay)
+    configure_logging(options["mode"], fmt, handlers=[handler], queued=options["queued"])
+    log_counts.clear()
+    monitor = LoopLagMonitor(interval=0.005, report_interval=0)
+    monitor.start()
+    await asyncio.sleep(0.05)
+    monitor.reset()
+    started = time.perf_counter()
+    await error_storm(records, per_tick, options["sampled"], numbers)
+    elapsed = time.perf_counter() - started
+    await asyncio.sleep(0.01)
+    monitor.stop()
+    configure_logging(handlers=[])
+    return elapsed, monitor.snapshot(), log_counts.get("SUPPRESSED", 0)
+
+async def main():
+    parser = argparse.ArgumentParser(description="Event loop lag during a per-number error storm under each logging backend")
+    parser.add_argument("--records", type=int, default=20000)
+    parser.add_argument("--numbers", type=int, default=500, help="distinct numbers failing in the storm")
+    parser.add_argument("--per-tick", type=int, default=50, help="records logged between yields to the loop")
+    parser.add_argument("--max-bytes", type=int, default=1000000, help="rollover size, small to include rollovers")
+    parser.add_argument("--io-delay", type=float, default=0.0, help="extra seconds per write, to emulate a slow disk or terminal")
+    parser.add_argument("--format", choices=["text", "json"], default="text")
+    parser.add_argument("--modes", nargs="+", choices=list(MODES), default=list(MODES))
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix="bench-logging-")
+    results = []
+    for name in args.modes:
+        results.append((name, *await measure(name, directory, args.records, args.per_tick, args.max_bytes, args.format, args.io_delay, args.numbers)))
+    print(f"{args.records} records over {args.numbers} numbers, {args.format} format, rollover every {args.max_bytes} bytes, {args.io_delay * 1000:.2f} ms extra per write")
+    print(f"{'backend':<9} {'storm (s)':>10} {'mean lag (ms)':>14} {'max lag (ms)':>13} {'suppressed':>11}")
+    for name, elapsed, lag, suppressed in results:
+        print(f"{name:<9} {elapsed:>10.3f} {lag['mean_ms']:>14.2f} {lag['max_ms']:>13.2f} {suppressed:>11}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,59 @@
+#Copyright @ISmartCoder
+#Updates Channel t.me/TheSmartDev
+import argparse
+import asyncio
+import time
+from benchmarks.portal_stub import range_names, render_sms_list, render_numbers, render_sms_details
+from utils import LoopLagMonitor, configure_executor, run_cpu, parse_ranges, parse_numbers, parse_sms_page, set_parser_backend
+
+async def synthetic_cycle(list_page, numbers_page, details_pages, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def parse_details(page):
+        async with semaphore:
+            await asyncio.sleep(0)
+            return await run_cpu(parse_sms_page, page)
+
+    await run_cpu(parse_ranges, list_page)
+    await run_cpu(parse_numbers, numbers_page)
+    return await asyncio.gather(*(parse_details(page) for page in details_pages))
+
+async def measure(mode, workers, pages, concurrency):
+    configure_executor(mode, workers)
+    await run_cpu(parse_sms_page, pages[2][0])
+    monitor = LoopLagMonitor(interval=0.005, report_interval=0)
+    monitor.start()
+    await asyncio.sleep(0.05)
+    monitor.reset()
+    started = time.perf_counter()
+    await synthetic_cycle(*pages, concurrency)
+    elapsed = time.perf_counter() - started
+    await asyncio.sleep(0.01)
+    monitor.stop()
+    configure_executor("inline")
+    return elapsed, monitor.snapshot()
+
+async def main():
+    parser = argparse.ArgumentParser(description="Event loop lag while parsing a synthetic 1000-number poll cycle")
+    parser.add_argument("--numbers", type=int, default=1000)
+    parser.add_argument("--ranges", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--backend", default="auto")
+    args = parser.parse_args()
+
+    print(f"parser backend: {set_parser_backend(args.backend)}")
+    list_page = render_sms_list(range_names(args.ranges), 7)
+    numbers_page = render_numbers([f"8801{n:08d}" for n in range(args.numbers)])
+    details_pages = [
+        render_sms_details("WhatsApp", f"Your WhatsApp code is {n % 900 + 100}-{n % 800 + 100}. Don't share this code")
+        for n in range(args.numbers)
+    ]
+    pages = (list_page, numbers_page, details_pages)
+    print(f"{'mode':<8} {'cycle (s)':>10} {'mean lag (ms)':>14} {'max lag (ms)':>13}")
+    for mode in ("inline", "thread", "process"):
+        elapsed, lag = await measure(mode, args.workers, pages, args.concurrency)
+        print(f"{mode:<8} {elapsed:>10.3f} {lag['mean_ms']:>14.2f} {lag['max_ms']:>13.2f}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
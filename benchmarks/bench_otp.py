@@ -0,0 +1,154 @@
+#Copyright @ISmartCoder
+#Updates Channel t.me/TheSmartDev
+import argparse
+import json
+import os
+import random
+import re
+import time
+from utils import NO_OTP, UNKNOWN_SERVICE, SERVICE_PATTERNS, analyze_message
+
+RECORDED_MESSAGES = "messages.jsonl"
+LABELLED_CORPUS = "benchmarks/otp_corpus.jsonl"
+
+TEMPLATES = [
+    "Your WhatsApp code is {a}-{b}. Don't share this code with others. 4sgLq1p5sV6",
+    "<#> {code} is your Facebook confirmation code. Reply STOP to +{phone}",
+    "Telegram code: {code5}. You can also tap on this link to log in: t.me/login/{code5}",
+    "G-{code} is your Google verification code.",
+    "Your Instagram code is {a} {b}. Don't share it.",
+    "Your Apple ID Code is: {code}. Don't share it with anyone. Sent {year}",
+    "{code} is your Amazon OTP. Do not share it with anyone.",
+    "Use {code} as Microsoft account security code",
+    "PayPal: Your security code is {code}. Your code expires in 10 minutes. Please don't reply.",
+    "[TikTok] {pin} is your verification code, valid for 5 minutes.",
+    "Dear customer, call {phone} about order {order}. Your login OTP is {code}",
+    "Welcome! {year} rewards: your verification code: {code}",
+    "Your balance is {pin} BDT as of {day}/{month}/{year}.",
+    "Happy {year}! Recharge {pin} and get 2GB free.",
+]
+
+def build_corpus(size, seed=11):
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(size):
+        template = rng.choice(TEMPLATES)
+        values = {
+            "a": f"{rng.randint(100, 999)}",
+            "b": f"{rng.randint(100, 999)}",
+            "code": f"{rng.randint(100000, 999999)}",
+            "code5": f"{rng.randint(10000, 99999)}",
+            "pin": f"{rng.randint(1000, 9999)}",
+            "phone": f"880{rng.randint(1000000000, 1999999999)}",
+            "order": f"{rng.randint(10000000, 99999999)}",
+            "year": f"{rng.randint(2019, 2026)}",
+            "day": f"{rng.randint(10, 28)}",
+            "month": f"{rng.randint(10, 12)}",
+        }
+        corpus.append((template.format(**values), None, None))
+    return corpus
+
+def legacy_extract_otp(text):
+    match = re.search(r'\b(\d{4,6}|\d{3}\s\d{3})\b|verification code: (\w+)', text, re.IGNORECASE)
+    return match.group(0) if match else NO_OTP
+
+def legacy_extract_service(message):
+    for service, pattern in SERVICE_PATTERNS.items():
+        if re.search(pattern, message, re.IGNORECASE):
+            return service
+    return UNKNOWN_SERVICE
+
+def legacy_analyze(text):
+    return legacy_extract_service(text), legacy_extract_otp(text)
+
+def load_corpus(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        records = [json.loads(line) for line in f if line.strip()]
+    return [(record["message"], record.get("service"), record["otp"] or NO_OTP if "otp" in record else None) for record in records]
+
+def throughput(fn, texts, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for text in texts:
+            fn(text)
+        best = min(best, time.perf_counter() - started)
+    return len(texts) / best
+
+def ratio(part, whole):
+    return f"{part / whole:>7.1%}" if whole else f"{'n/a':>7}"
+
+def score(analyze, corpus):
+    results = [(analyze(text), service, otp) for text, service, otp in corpus]
+    services = [(found, service) for (found, _), service, _ in results if service is not None]
+    otps = [(found, otp) for (_, found), _, otp in results if otp is not None]
+    return {
+        "services": services,
+        "otps": otps,
+        "per_service": [(service, found_otp == otp) for (_, found_otp), service, otp in results if service is not None and otp is not None],
+    }
+
+def print_accuracy(scores):
+    print(f"{'extractor':<8} {'service':>8} {'otp':>8} {'false OTPs':>11} {'missed':>7}")
+    for name, scored in scores.items():
+        services, otps = scored["services"], scored["otps"]
+        service_correct = sum(1 for found, expected in services if found == expected)
+        otp_correct = sum(1 for found, expected in otps if found == expected)
+        false_otps = sum(1 for found, expected in otps if found != NO_OTP and found != expected)
+        missed = sum(1 for found, expected in otps if found == NO_OTP and expected != NO_OTP)
+        print(f"{name:<8} {ratio(service_correct, len(services))} {ratio(otp_correct, len(otps))} {false_otps:>11} {missed:>7}")
+
+def print_per_service(scores):
+    names = list(scores)
+    labels = sorted({expected for scored in scores.values() for _, expected in scored["services"]} - {UNKNOWN_SERVICE}) + [UNKNOWN_SERVICE]
+    header = "".join(f" {name + ' P':>9} {name + ' R':>9} {name + ' otp':>10}" for name in names)
+    print(f"{'service':<10} {'n':>3}{header}")
+    for label in labels:
+        row = ""
+        support = 0
+        for name in names:
+            services = scores[name]["services"]
+            predicted = sum(1 for found, _ in services if found == label)
+            actual = sum(1 for _, expected in services if expected == label)
+            hits = sum(1 for found, expected in services if found == expected == label)
+            otp_hits = [correct for service, correct in scores[name]["per_service"] if service == label]
+            support = actual
+            row += f" {ratio(hits, predicted):>9} {ratio(hits, actual):>9} {ratio(sum(otp_hits), len(otp_hits)):>10}"
+        print(f"{label:<10} {support:>3}{row}")
+
+def main():
+    parser = argparse.ArgumentParser(description="OTP extraction and service classification accuracy and throughput")
+    parser.add_argument("--messages", type=int, default=50000)
+    parser.add_argument("--corpus", default=LABELLED_CORPUS, help="JSON-lines file of {\"message\": ..., \"service\": ..., \"otp\": ...} records, null otp means no OTP")
+    parser.add_argument("--recordings", default="benchmarks/recordings", help=f"directory holding the {RECORDED_MESSAGES} written by record_portal.py, timed instead of the templates")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--show", type=int, default=10, help="unlabelled messages where the extractors disagree to print")
+    args = parser.parse_args()
+
+    labelled = load_corpus(args.corpus)
+    print(f"{len(labelled)} labelled messages from {args.corpus}")
+    scores = {"legacy": score(legacy_analyze, labelled), "engine": score(analyze_message, labelled)}
+    print_accuracy(scores)
+    print()
+    print_per_service(scores)
+    print()
+
+    path = os.path.join(args.recordings, RECORDED_MESSAGES)
+    if os.path.exists(path):
+        corpus = load_corpus(path)
+        print(f"{len(corpus)} recorded messages from {path}")
+    else:
+        corpus = build_corpus(args.messages)
+        print(f"no recordings at {path}, {len(corpus)} synthetic template messages (throughput only, the templates were written for this benchmark)")
+    texts = [text for text, _, _ in corpus]
+    for name, fn in (("legacy otp", legacy_extract_otp), ("legacy", legacy_analyze), ("engine", analyze_message)):
+        print(f"{name:<11} {throughput(fn, texts, args.repeat):>10,.0f} msg/s")
+    unlabelled = [text for text, _, expected in corpus if expected is None]
+    disagreements = [text for text in unlabelled if legacy_extract_otp(text) != analyze_message(text)[1]]
+    if unlabelled:
+        print(f"{len(disagreements)}/{len(unlabelled)} unlabelled messages where legacy and engine disagree, label them in {args.corpus} to score them:")
+        for text in disagreements[:args.show]:
+            print(f"  {legacy_extract_otp(text)!r:>16} {analyze_message(text)[1]!r:>16}  {text!r}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+#Copyright @ISmartCoder
+#Updates Channel t.me/TheSmartDev
+import argparse
+import os
+import timeit
+from benchmarks.portal_stub import RECORDED_PAGES, range_names, render_login_page, render_sms_list, render_numbers, render_sms_details
+from utils import extract
+
+FIXTURE_FILES = {
+    "login": RECORDED_PAGES["login"],
+    "getsms": RECORDED_PAGES["list"],
+    "getsms/number": RECORDED_PAGES["numbers"],
+    "getsms/number/sms": RECORDED_PAGES["details"],
+}
+
+PAGE_PARSERS = {
+    "login": 0,
+    "getsms": 1,
+    "getsms/number": 2,
+    "getsms/number/sms": 3,
+}
+
+def synthetic_pages(ranges, numbers):
+    return {
+        "login": render_login_page(),
+        "getsms": render_sms_list(range_names(ranges), 42),
+        "getsms/number": render_numbers([f"8801{n:08d}" for n in range(numbers)]),
+        "getsms/number/sms": render_sms_details("WhatsApp", "Your WhatsApp code is 123-456. Don't share this code with others"),
+    }
+
+def load_pages(fixtures, ranges, numbers):
+    pages = synthetic_pages(ranges, numbers)
+    if fixtures:
+        for page, filename in FIXTURE_FILES.items():
+            path = os.path.join(fixtures, filename)
+            if os.path.exists(path):
+                with open(path, 'r', encoding='utf-8') as f:
+                    pages[page] = f.read()
+    return pages
+
+def main():
+    parser = argparse.ArgumentParser(description="HTML extraction backends over portal pages")
+    parser.add_argument("--fixtures", help="directory with recorded pages (login.html, getsms.html, getsms_number.html, getsms_number_sms.html)")
+    parser.add_argument("--ranges", type=int, default=200)
+    parser.add_argument("--numbers", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    pages = load_pages(args.fixtures, args.ranges, args.numbers)
+    backends = list(extract.PARSERS)
+    print(f"{'page':<20} {'bytes':>9} " + " ".join(f"{name + ' (ms)':>12}" for name in backends) + "  identical")
+    for page, text in pages.items():
+        index = PAGE_PARSERS[page]
+        results = [extract.PARSERS[name][index](text) for name in backends]
+        timings = [
+            min(timeit.repeat(lambda fn=extract.PARSERS[name][index]: fn(text), number=1, repeat=args.repeat)) * 1000
+            for name in backends
+        ]
+        identical = all(result == results[0] for result in results)
+        print(f"{page:<20} {len(text):>9} " + " ".join(f"{t:>12.3f}" for t in timings) + f"  {identical}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#Copyright @ISmartCoder
+#Updates Channel t.me/TheSmartDev
+import argparse
+import gc
+import os
+import tempfile
+import time
+import tracemalloc
+from utils import SmsRecord, SmsCache, OtpHistory
+
+RANGES = 50
+NUMBERS = 200000
+COUNTRIES = [name.encode() for name in ("Bangladesh", "Nigeria", "Pakistan", "Indonesia", "Kenya", "Egypt", "Vietnam", "Myanmar")]
+EMOJIS = [emoji.encode() for emoji in ("🇧🇩", "🇳🇬", "🇵🇰", "🇮🇩", "🇰🇪", "🇪🇬", "🇻🇳", "🇲🇲")]
+SERVICES = [name.encode() for name in ("WhatsApp", "Telegram", "Facebook", "Google", "TikTok", "Instagram", "Viber", "Imo")]
+
+def parsed_fields(i):
+    country = COUNTRIES[i % len(COUNTRIES)].decode()
+    service = SERVICES[i % len(SERVICES)].decode()
+    number = f"880{i % NUMBERS:09d}"
+    otp = f"{i % 1000000:06d}"
+    message = f"Your {service} code is {otp}. Don't share this code with others"
+    return (
+        f"{country.upper()} IPRN {i % RANGES}", 7, country, EMOJIS[i % len(EMOJIS)].decode(), service,
+        number, otp, message, f"{number}_{message[:50]}"
+    )
+
+def dict_entry(i):
+    range_name, count, country, country_emoji, service, number, otp, full_message, message_id = parsed_fields(i)
+    return {
+        "range": range_name,
+        "count": count,
+        "country": country,
+        "country_emoji": country_emoji,
+        "service": service,
+        "number": number,
+        "otp": otp,
+        "full_message": full_message,
+        "message_id": message_id,
+        "first_seen": time.time()
+    }
+
+def record_entry(i):
+    return SmsRecord(*parsed_fields(i))
+
+def measure(build, count):
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    queued = [build(i) for i in range(count)]
+    queued_bytes = tracemalloc.get_traced_memory()[0]
+    elapsed = time.perf_counter() - started
+    return queued, queued_bytes, elapsed
+
+def measure_cache(entries, directory):
+    cache = SmsCache(os.path.join(directory, "sms_cache.json"), compact_every=len(entries) + 1)
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    for sms in entries:
+        cache.add(sms.message_id, sms.first_seen)
+    elapsed = time.perf_counter() - started
+    cache_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    cache.close()
+    return cache_bytes, os.path.getsize(cache.path), elapsed
+
+def measure_otp_history(entries, directory, batch=1000):
+    history = OtpHistory(os.path.join(directory, "otp_history.db"), window=86400)
+    started = time.perf_counter()
+    for i in range(0, len(entries), batch):
+        history.commit(entries[i:i + batch])
+    elapsed = time.perf_counter() - started
+    history.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    history.close()
+    return os.path.getsize(history.path), elapsed
+
+def report(label, count, queued_bytes, elapsed):
+    print(f"{label:>7}: queued {queued_bytes / 2 ** 20:8.1f} MiB ({queued_bytes / count:5.0f} B/msg), built in {elapsed:.1f} s")
+
+def main():
+    parser = argparse.ArgumentParser(description="Traced memory of queued SMS as dict entries vs SmsRecord, and the size of the SmsCache and OtpHistory dedup stores")
+    parser.add_argument("--count", type=int, default=1000000)
+    args = parser.parse_args()
+    print(f"{args.count} messages over {RANGES} ranges and {NUMBERS} numbers")
+    for label, build in (("dict", dict_entry), ("record", record_entry)):
+        queued, queued_bytes, elapsed = measure(build, args.count)
+        tracemalloc.stop()
+        report(label, args.count, queued_bytes, elapsed)
+        del queued
+    entries = [record_entry(i) for i in range(args.count)]
+    directory = tempfile.mkdtemp(prefix="bench-records-")
+    cache_bytes, journal_bytes, cache_elapsed = measure_cache(entries, directory)
+    print(
+        f"SmsCache: {cache_bytes / 2 ** 20:8.1f} MiB in memory ({cache_bytes / args.count:4.0f} B/msg), "
+        f"journal {journal_bytes / args.count:4.0f} B/msg, added in {cache_elapsed:.1f} s"
+    )
+    history_bytes, history_elapsed = measure_otp_history(entries, directory)
+    print(f"OtpHistory: {history_bytes / 2 ** 20:8.1f} MiB on disk ({history_bytes / args.count:4.0f} B/msg), committed in {history_elapsed:.1f} s")
+
+if __name__ == "__main__":
+    main()
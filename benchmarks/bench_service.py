@@ -0,0 +1,59 @@
+#Copyright @ISmartCoder
+#Updates Channel t.me/TheSmartDev
+import argparse
+import random
+import re
+import time
+from utils import SERVICE_PATTERNS, classify_service
+
+TEMPLATES = [
+    "Your WhatsApp code is {code}. Don't share this code with others",
+    "<#> {code} is your Facebook confirmation code",
+    "Telegram code: {code}. You can also tap on this link to log in: t.me/login/{code}",
+    "G-{code} is your Google verification code.",
+    "Your Instagram code is {code}. Don't share it.",
+    "Your Lalamove verification code is {code}",
+    "Your Apple ID Code is: {code}. Don't share it with anyone.",
+    "{code} is your Amazon OTP. Do not share it with anyone.",
+    "Use {code} as Microsoft account security code",
+    "PayPal: Your security code is {code}. Your code expires in 10 minutes.",
+    "Your Netflix verification code is {code}",
+    "Your Uber code: {code}. Never share this code.",
+    "[TikTok] {code} is your verification code, valid for 5 minutes.",
+    "Your LinkedIn verification code is {code}.",
+    "Spotify: Your code is {code}",
+    "Your bank one-time password is {code}, valid for 3 minutes",
+    "Dear customer, {code} is your login PIN for portal access on 2025-01-01",
+]
+
+def legacy_extract_service(message):
+    for service, pattern in SERVICE_PATTERNS.items():
+        if re.search(pattern, message, re.IGNORECASE):
+            return service
+    return "Unknown"
+
+def build_corpus(size, seed=7):
+    rng = random.Random(seed)
+    return [rng.choice(TEMPLATES).format(code=rng.randint(100000, 999999)) for _ in range(size)]
+
+def timed(fn, corpus):
+    started = time.perf_counter()
+    results = [fn(message) for message in corpus]
+    return time.perf_counter() - started, results
+
+def main():
+    parser = argparse.ArgumentParser(description="Service classification: per-pattern loop vs the single-pass OTP scanner")
+    parser.add_argument("--messages", type=int, default=100000)
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.messages)
+    legacy_time, legacy = timed(legacy_extract_service, corpus)
+    scanner_time, scanner = timed(classify_service, corpus)
+    mismatches = sum(1 for a, b in zip(legacy, scanner) if a != b)
+    print(f"{args.messages} messages")
+    print(f"pattern loop: {legacy_time:.3f} s ({args.messages / legacy_time:,.0f} msg/s)")
+    print(f"scanner:      {scanner_time:.3f} s ({args.messages / scanner_time:,.0f} msg/s)")
+    print(f"mismatches:   {mismatches}")
+
+if __name__ == "__main__":
+    main()
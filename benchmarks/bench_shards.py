@@ -0,0 +1,106 @@
+#Copyright @ISmartCoder
+#Updates Channel t.me/TheSmartDev
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+from benchmarks.portal_stub import PortalStub
+
+async def child(url, state_dir, shard, shards):
+    from utils import configure_logging
+    import modules.scraper as scraper
+    import modules.worker as worker
+    configure_logging(handlers=[logging.StreamHandler()])
+    stub = PortalStub()
+    stub.base_url = url
+    stub.patch_urls(scraper)
+    scraper.SMS_CACHE_FILE = os.path.join(state_dir, "sms_cache.json")
+    scraper.POLL_STATE_FILE = os.path.join(state_dir, "poll_state.json")
+    scraper.SESSION_COOKIE_FILE = os.path.join(state_dir, "session_cookies.json")
+    scraper.SESSION_TOKEN_FILE = os.path.join(state_dir, "session_token.json")
+    scraper.otp_history = scraper.OtpHistory(os.path.join(state_dir, "otp_history.db"))
+    scraper.warm_cache_file = os.path.join(state_dir, "warm_cache.json")
+    return await worker.run_worker(0, shard, shards)
+
+async def read_worker(process, received, expected, done):
+    while True:
+        line = await process.stdout.readline()
+        if not line:
+            return
+        sms = json.loads(line)
+        received[sms["message_id"]] = time.time()
+        process.stdin.write((json.dumps(sms["message_id"], ensure_ascii=False) + "\n").encode())
+        await process.stdin.drain()
+        if len(received) >= expected:
+            done.set()
+
+async def run(shards, args):
+    stub = PortalStub(ranges=args.ranges, numbers=args.numbers, latency=args.latency)
+    url = await stub.start()
+    stub.add_messages_everywhere()
+    expected = args.ranges * args.numbers
+    state_dir = tempfile.mkdtemp(prefix=f"bench-shards-{shards}-")
+    received = {}
+    done = asyncio.Event()
+    started = time.time()
+    processes = [
+        await asyncio.create_subprocess_exec(
+            sys.executable, "-m", "benchmarks.bench_shards", "--child", url, "--state", state_dir,
+            "--shard", str(shard), "--shard-count", str(shards),
+            stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.DEVNULL
+        )
+        for shard in range(shards)
+    ]
+    readers = [asyncio.ensure_future(read_worker(process, received, expected, done)) for process in processes]
+    try:
+        await asyncio.wait_for(done.wait(), args.timeout)
+    except asyncio.TimeoutError:
+        pass
+    drained = time.time() - started
+    for process in processes:
+        process.stdin.close()
+    codes = await asyncio.gather(*(process.wait() for process in processes))
+    for reader in readers:
+        reader.cancel()
+    await stub.stop()
+    first = min(received.values(), default=started) - started
+    return {
+        "received": len(received),
+        "expected": expected,
+        "first": first,
+        "drained": drained,
+        "requests": stub.requests,
+        "codes": codes
+    }
+
+async def main(args):
+    print(f"{args.ranges}x{args.numbers} numbers with a pending SMS, {args.latency * 1000:.0f} ms portal latency")
+    baseline = None
+    for shards in args.shards:
+        result = await run(shards, args)
+        baseline = baseline or result["drained"]
+        print(
+            f"{shards} shard(s): {result['received']}/{result['expected']} OTPs, first after {result['first']:.2f} s, "
+            f"all after {result['drained']:.2f} s ({baseline / result['drained']:.2f}x), "
+            f"{result['requests'] / result['drained']:.0f} portal req/s, worker exit codes {result['codes']}"
+        )
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backlog drain time of the sharded scraper workers for 1..N processes")
+    parser.add_argument("--shards", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--ranges", type=int, default=20)
+    parser.add_argument("--numbers", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.05, help="portal latency per request (s)")
+    parser.add_argument("--timeout", type=float, default=120)
+    parser.add_argument("--child")
+    parser.add_argument("--state")
+    parser.add_argument("--shard", type=int, default=0)
+    parser.add_argument("--shard-count", type=int, default=1)
+    args = parser.parse_args()
+    if args.child:
+        sys.exit(asyncio.run(child(args.child, args.state, args.shard, args.shard_count)))
+    asyncio.run(main(args))
@@ -0,0 +1,73 @@
+#Copyright @ISmartCoder
+#Updates Channel t.me/TheSmartDev
+import argparse
+import asyncio
+import importlib
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+async def child(state_dir, spawned_at, resolve_latency):
+    started = time.time()
+    scraper = importlib.import_module("modules.scraper")
+    imported = time.time()
+    from benchmarks.portal_stub import PortalStub
+    from benchmarks.fake_telegram import FakeTelegramClient
+    from utils import SubscriptionIndex
+
+    stub = PortalStub(ranges=10, numbers=20, latency=0.05)
+    await stub.start()
+    stub.patch_urls(scraper)
+    stub.isolate_state(scraper, state_dir)
+    scraper.CHAT_IDS = [-1000000000000 - i for i in range(5)]
+    scraper.routes = SubscriptionIndex(os.path.join(state_dir, "subscriptions.json"), scraper.CHAT_IDS)
+    client = FakeTelegramClient(latency=0.02, resolve_latency=resolve_latency)
+    scraper.setup_otp_handler(client)
+    while "list" not in stub.first_request:
+        await asyncio.sleep(0.001)
+    first_poll = stub.first_request["list"]
+    await asyncio.sleep(max(resolve_latency * 2, 0.2))
+    print(json.dumps({
+        "interpreter": started - spawned_at,
+        "import": imported - started,
+        "first_poll": first_poll - spawned_at,
+        "logins": stub.page_requests["login"],
+        "resolves": client.calls["get_input_entity"] + client.calls["get_entity"],
+    }))
+    await stub.stop()
+
+def run_child(state_dir, resolve_latency):
+    spawned_at = time.time()
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_startup", "--child", state_dir,
+         "--spawned-at", repr(spawned_at), "--resolve-latency", str(resolve_latency)],
+        capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description="Time from process start to the first portal poll, cold and with a warm cache")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--resolve-latency", type=float, default=0.15, help="emulated Telegram round trip per peer lookup (s)")
+    parser.add_argument("--child")
+    parser.add_argument("--spawned-at", type=float)
+    args = parser.parse_args()
+    if args.child:
+        asyncio.run(child(args.child, args.spawned_at, args.resolve_latency))
+        return
+
+    print(f"{'start':<6} {'interpreter (s)':>16} {'import (s)':>11} {'first poll (s)':>15} {'logins':>7} {'peer lookups':>13}")
+    for _ in range(args.runs):
+        state_dir = tempfile.mkdtemp(prefix="bench-startup-")
+        for label in ("cold", "warm"):
+            result = run_child(state_dir, args.resolve_latency)
+            print(
+                f"{label:<6} {result['interpreter']:>16.3f} {result['import']:>11.3f} "
+                f"{result['first_poll']:>15.3f} {result['logins']:>7} {result['resolves']:>13}"
+            )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+#Copyright @ISmartCoder
+#Updates Channel t.me/TheSmartDev
+import asyncio
+import random
+import time
+from collections import Counter
+from types import SimpleNamespace
+from telethon.errors import FloodWaitError
+from telethon.tl.types import InputPeerChannel, InputPeerUser
+
+class FakeTelegramClient:
+    def __init__(self, latency=0.02, flood_rate=0.0, flood_seconds=1, seed=1, resolve_latency=None):
+        self.latency = latency
+        self.resolve_latency = latency if resolve_latency is None else resolve_latency
+        self.flood_rate = flood_rate
+        self.flood_seconds = flood_seconds
+        self.random = random.Random(seed)
+        self.calls = Counter()
+        self.sent = []
+        self.message_ids = 0
+
+    @property
+    def loop(self):
+        return asyncio.get_running_loop()
+
+    async def call(self, method, latency=None):
+        self.calls[method] += 1
+        latency = self.latency if latency is None else latency
+        if latency:
+            await asyncio.sleep(latency)
+
+    async def get_entity(self, chat_id):
+        await self.call("get_entity", self.resolve_latency)
+        return SimpleNamespace(id=chat_id, first_name="Bench", last_name="", title="Bench Chat")
+
+    async def get_input_entity(self, chat_id):
+        await self.call("get_input_entity", self.resolve_latency)
+        if chat_id < 0:
+            return InputPeerChannel(channel_id=-chat_id % 10 ** 12, access_hash=chat_id * 7)
+        return InputPeerUser(user_id=chat_id, access_hash=chat_id * 7)
+
+    async def send_message(self, entity, message, **kwargs):
+        await self.call("send_message")
+        if self.flood_rate and self.random.random() < self.flood_rate:
+            self.calls["flood_wait"] += 1
+            raise FloodWaitError(request=None, capture=self.flood_seconds)
+        self.message_ids += 1
+        self.sent.append((time.time(), entity, message, kwargs))
+        return SimpleNamespace(id=self.message_ids, chat_id=entity, message=message)
+
+    async def edit_message(self, entity, message, text=None, **kwargs):
+        await self.call("edit_message")
+        return message
+
+    async def delete_messages(self, entity, message_ids, **kwargs):
+        await self.call("delete_messages")
@@ -0,0 +1,196 @@
+#Copyright @ISmartCoder
+#Updates Channel t.me/TheSmartDev
+import asyncio
+import gzip
+import html
+import itertools
+import os
+import random
+import time
+from collections import Counter
+from aiohttp import web
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+LOGIN_PATH = "/login"
+SMS_LIST_PATH = "/portal/sms/received/getsms"
+SMS_NUMBERS_PATH = "/portal/sms/received/getsms/number"
+SMS_DETAILS_PATH = "/portal/sms/received/getsms/number/sms"
+RECORDED_PAGES = {
+    "login": "login.html",
+    "list": "getsms.html",
+    "numbers": "getsms_number.html",
+    "details": "getsms_number_sms.html",
+}
+COUNTRIES = ["Bangladesh", "India", "Nigeria", "Indonesia", "Kenya", "Pakistan", "Egypt", "Brazil", "USA", "UK"]
+
+def range_names(ranges):
+    return [f"{COUNTRIES[i % len(COUNTRIES)]} Range {i}" for i in range(ranges)]
+
+def render_login_page(token="stub-token"):
+    return f'<html><body><form method="post"><input type="hidden" name="_token" value="{token}"></form></body></html>'
+
+def render_sms_list(names, count):
+    counts = count if isinstance(count, dict) else dict.fromkeys(names, count)
+    items = "".join(
+        f'<div class="item"><div class="col-sm-4">{html.escape(name)}</div><div class="col-3"><p>{counts[name]}</p></div></div>'
+        for name in names
+    )
+    return f"<div>{items}</div>"
+
+def render_numbers(numbers):
+    return "".join(f'<div class="card"><div class="col-sm-4">{number}</div></div>' for number in numbers)
+
+def render_sms_details(service, message):
+    return (
+        f'<div class="row"><div class="col-sm-4">CLI {html.escape(service)}</div>'
+        f'<div class="col-9 col-sm-6"><p class="mb-0 pb-0">{html.escape(message)}</p></div></div>'
+    )
+
+def load_recordings(directory):
+    pages = {}
+    for page, filename in RECORDED_PAGES.items():
+        path = os.path.join(directory, filename)
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                pages[page] = f.read()
+    return pages
+
+class PortalStub:
+    def __init__(self, ranges=10, numbers=20, latency=0.05, throttle_rate=0.0, encoding=None, recordings=None, seed=1):
+        self.names = range_names(ranges)
+        self.numbers = {
+            name: [f"88{index:04d}{n:05d}" for n in range(numbers)]
+            for index, name in enumerate(self.names)
+        }
+        self.number_range = {number: name for name, numbers in self.numbers.items() for number in numbers}
+        self.latency = latency
+        self.throttle_rate = throttle_rate
+        self.encoding = encoding
+        self.recordings = load_recordings(recordings) if recordings else {}
+        self.random = random.Random(seed)
+        self.codes = itertools.count(100000)
+        self.counts = dict.fromkeys(self.names, 0)
+        self.messages = {}
+        self.arrivals = {}
+        self.expired = False
+        self.requests = 0
+        self.page_requests = Counter()
+        self.first_request = {}
+        self.bytes_sent = 0
+        self.throttled = 0
+        self.runner = None
+        self.base_url = None
+        self.traffic_task = None
+
+    def add_message(self, number=None, service="WhatsApp"):
+        number = number or self.random.choice(list(self.number_range))
+        code = next(self.codes)
+        self.counts[self.number_range[number]] += 1
+        self.messages[number] = (service, f"Your {service} code is {code}. Don't share this code with others")
+        self.arrivals[str(code)] = time.time()
+        return code
+
+    def add_messages_everywhere(self):
+        for number in self.number_range:
+            self.add_message(number)
+
+    async def generate_traffic(self, rate):
+        while True:
+            await asyncio.sleep(self.random.expovariate(rate))
+            self.add_message()
+
+    def start_traffic(self, rate):
+        if rate and self.traffic_task is None:
+            self.traffic_task = asyncio.ensure_future(self.generate_traffic(rate))
+
+    async def respond(self, page, text):
+        self.requests += 1
+        self.page_requests[page] += 1
+        self.first_request.setdefault(page, time.time())
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if page != "login" and self.throttle_rate and self.random.random() < self.throttle_rate:
+            self.throttled += 1
+            return web.Response(status=429, headers={"Retry-After": "1"})
+        text = self.recordings.get(page, text)
+        body = text.encode('utf-8')
+        headers = {"Content-Type": "text/html; charset=UTF-8"}
+        if self.encoding == "gzip":
+            body = gzip.compress(body)
+            headers["Content-Encoding"] = "gzip"
+        elif self.encoding == "br" and brotli:
+            body = brotli.compress(body)
+            headers["Content-Encoding"] = "br"
+        self.bytes_sent += len(body)
+        return web.Response(body=body, headers=headers)
+
+    async def handle_login(self, request):
+        return await self.respond("login", render_login_page())
+
+    async def handle_login_post(self, request):
+        self.expired = False
+        return await self.respond("login", render_login_page())
+
+    async def handle_list(self, request):
+        if self.expired:
+            self.requests += 1
+            return web.Response(status=419)
+        return await self.respond("list", render_sms_list(self.names, self.counts))
+
+    async def handle_numbers(self, request):
+        if self.expired:
+            self.requests += 1
+            return web.Response(status=419)
+        data = await request.post()
+        return await self.respond("numbers", render_numbers(self.numbers.get(data.get("range", ""), [])))
+
+    async def handle_details(self, request):
+        if self.expired:
+            self.requests += 1
+            return web.Response(status=419)
+        data = await request.post()
+        service, message = self.messages.get(data.get("Number", ""), ("Unknown", ""))
+        return await self.respond("details", render_sms_details(service, message) if message else "")
+
+    async def start(self, host="127.0.0.1", port=0):
+        app = web.Application()
+        app.router.add_get(LOGIN_PATH, self.handle_login)
+        app.router.add_post(LOGIN_PATH, self.handle_login_post)
+        app.router.add_post(SMS_LIST_PATH, self.handle_list)
+        app.router.add_post(SMS_NUMBERS_PATH, self.handle_numbers)
+        app.router.add_post(SMS_DETAILS_PATH, self.handle_details)
+        self.runner = web.AppRunner(app, access_log=None)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, host, port)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.base_url = f"http://{host}:{port}"
+        return self.base_url
+
+    async def stop(self):
+        if self.traffic_task is not None:
+            self.traffic_task.cancel()
+        if self.runner:
+            await self.runner.cleanup()
+
+    def patch_urls(self, module):
+        module.LOGIN_URL = self.base_url + LOGIN_PATH
+        module.SMS_LIST_URL = self.base_url + SMS_LIST_PATH
+        module.SMS_NUMBERS_URL = self.base_url + SMS_NUMBERS_PATH
+        module.SMS_DETAILS_URL = self.base_url + SMS_DETAILS_PATH
+
+    def isolate_state(self, module, directory):
+        module.sms_cache = module.SmsCache(os.path.join(directory, "sms_cache.json"))
+        module.otp_history = module.OtpHistory(os.path.join(directory, "otp_history.db"))
+        module.portal_session = module.PortalSession(
+            os.path.join(directory, "session_cookies.json"),
+            os.path.join(directory, "session_token.json")
+        )
+        module.poll_state = module.PollState()
+        module.health = module.HealthTracker()
+        module.outbox = module.Outbox(os.path.join(directory, "outbox.db"))
+        module.warm_cache_file = os.path.join(directory, "warm_cache.json")
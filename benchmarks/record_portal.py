@@ -0,0 +1,85 @@
+#Copyright @ISmartCoder
+#Updates Channel t.me/TheSmartDev
+import argparse
+import asyncio
+import json
+import os
+from benchmarks.portal_stub import RECORDED_PAGES
+from benchmarks.bench_otp import RECORDED_MESSAGES
+import modules.scraper as scraper
+from utils import create_session, read_text, parse_sms_details
+
+def save_page(directory, page, text):
+    path = os.path.join(directory, RECORDED_PAGES[page])
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    print(f"saved {page}: {len(text)} chars -> {path}")
+
+def save_messages(directory, messages):
+    path = os.path.join(directory, RECORDED_MESSAGES)
+    with open(path, 'a', encoding='utf-8') as f:
+        for record in messages:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    print(f"saved {len(messages)} messages -> {path}")
+
+async def record_messages(session, csrf_token, headers, ranges, limit):
+    messages = []
+    for range_name, _ in ranges:
+        numbers_text = await scraper.portal_post(
+            session, scraper.SMS_NUMBERS_URL, headers,
+            f"_token={csrf_token}&start=&end=&range={range_name}", f"range {range_name}", "numbers"
+        )
+        for number in scraper.parse_numbers(numbers_text):
+            if len(messages) >= limit:
+                return messages
+            details_text = await scraper.portal_post(
+                session, scraper.SMS_DETAILS_URL, headers,
+                f"_token={csrf_token}&start=&end=&Number={number}&Range={range_name}", f"number {number}", "details"
+            )
+            found, service_text = parse_sms_details(details_text)
+            service = service_text.strip().replace('CLI', '').strip() if service_text is not None else None
+            messages.extend({"message": message, "service": service} for message in found)
+    return messages
+
+async def main():
+    parser = argparse.ArgumentParser(description="Record live portal pages for replay by the portal stub")
+    parser.add_argument("--output", default="benchmarks/recordings")
+    parser.add_argument("--account", type=int, default=0)
+    parser.add_argument("--messages", type=int, default=200, help="SMS texts to append to the OTP extraction corpus")
+    args = parser.parse_args()
+    os.makedirs(args.output, exist_ok=True)
+    scraper.credentials.update(scraper.ACCOUNTS[args.account])
+
+    async with create_session() as session:
+        async with session.get(scraper.LOGIN_URL, timeout=10) as response:
+            save_page(args.output, "login", await read_text(response))
+        if not await scraper.login(session):
+            print("login failed")
+            return
+        csrf_token = await scraper.ensure_csrf_token(session)
+        list_text = await scraper.fetch_sms_list(session, csrf_token)
+        save_page(args.output, "list", list_text)
+        ranges = scraper.parse_ranges(list_text)
+        if not ranges:
+            return
+        range_name = ranges[0][0]
+        headers = scraper.SMS_HEADERS.copy()
+        headers["X-CSRF-TOKEN"] = csrf_token
+        numbers_text = await scraper.portal_post(
+            session, scraper.SMS_NUMBERS_URL, headers,
+            f"_token={csrf_token}&start=&end=&range={range_name}", f"range {range_name}", "numbers"
+        )
+        save_page(args.output, "numbers", numbers_text)
+        numbers = scraper.parse_numbers(numbers_text)
+        if not numbers:
+            return
+        details_text = await scraper.portal_post(
+            session, scraper.SMS_DETAILS_URL, headers,
+            f"_token={csrf_token}&start=&end=&Number={numbers[0]}&Range={range_name}", f"number {numbers[0]}", "details"
+        )
+        save_page(args.output, "details", details_text)
+        if args.messages > 0:
+            save_messages(args.output, await record_messages(session, csrf_token, headers, ranges, args.messages))
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,150 @@
+#Copyright @ISmartCoder
+#Updates Channel t.me/TheSmartDev
+import asyncio
+import functools
+import html
+import time
+from telethon import TelegramClient, events, Button
+from telethon.errors import FloodWaitError
+from utils import LOGGER, METRICS, TokenBucket, COMMAND_USER_RATE, COMMAND_GLOBAL_RATE, COMMAND_CHAT_CACHE_TTL, COMMAND_ANIMATION, COMMAND_ANIMATION_MAX_BACKLOG
+from config import COMMAND_PREFIX, UPDATE_CHANNEL_URL
+from modules.dispatcher import PRIORITY_COMMAND
+import modules.scraper as scraper
+
+WELCOME_BODY = (
+    "**━━━━━━━━━━━━━━━━━━━━━━**\n"
+    "**Smart OTP** The ultimate toolkit on Telegram, offering various countries otp to you instantly after sending. Enjoy earning ,oney with our bot.\n"
+    "**━━━━━━━━━━━━━━━━━━━━━━**\n"
+    f"**Don't forget to [ Join Here]({UPDATE_CHANNEL_URL}) for updates!**"
+)
+UPDATES_BUTTONS = [[Button.url("Updates Channel", UPDATE_CHANNEL_URL)]]
+ANIMATION_STEPS = ("<b>Generating Session Keys Please Wait...</b>",)
+ANIMATION_RPCS = 3
+
+chat_titles = {}
+user_buckets = {}
+command_bucket = TokenBucket(COMMAND_GLOBAL_RATE, COMMAND_GLOBAL_RATE)
+
+@functools.lru_cache(maxsize=1024)
+def render_private(full_name, flag=" "):
+    return f"**Hi {html.escape(full_name)}{flag}! Welcome To This Bot**\n" + WELCOME_BODY
+
+@functools.lru_cache(maxsize=1024)
+def render_group(group_name):
+    return f"**Hi! Welcome {html.escape(group_name)} To This Bot**\n" + WELCOME_BODY
+
+def sender_name(event):
+    full_name = "User"
+    if event.sender:
+        first_name = getattr(event.sender, 'first_name', '') or ""
+        last_name = getattr(event.sender, 'last_name', '') or ""
+        full_name = f"{first_name} {last_name}".strip() or "User"
+    return full_name
+
+async def chat_title(event):
+    cached = chat_titles.get(event.chat_id)
+    now = time.monotonic()
+    if cached is not None and now - cached[1] < COMMAND_CHAT_CACHE_TTL:
+        METRICS.inc("command_chat_cache_hits_total")
+        return cached[0]
+    METRICS.inc("command_chat_cache_misses_total")
+    chat_entity = await event.get_chat()
+    title = getattr(chat_entity, 'title', None) or 'this group'
+    chat_titles[event.chat_id] = (title, now)
+    return title
+
+def take(buckets, key, rate):
+    bucket = buckets.get(key)
+    if bucket is None:
+        bucket = buckets[key] = TokenBucket(rate)
+    if bucket.delay() > 0:
+        return False
+    bucket.consume()
+    return True
+
+def allow_command(event, command):
+    if not take(user_buckets, event.sender_id, COMMAND_USER_RATE):
+        METRICS.inc("commands_throttled_total", command=command, reason="user")
+        return False
+    dispatcher = scraper.dispatcher
+    if dispatcher is not None and dispatcher.chat_bucket(event.chat_id, PRIORITY_COMMAND).delay() > 0:
+        METRICS.inc("commands_throttled_total", command=command, reason="chat")
+        return False
+    if command_bucket.delay() > 0:
+        METRICS.inc("commands_throttled_total", command=command, reason="budget")
+        return False
+    command_bucket.consume()
+    return True
+
+def delivery_backlog():
+    return scraper.dispatcher.queue.qsize() if scraper.dispatcher is not None else 0
+
+def should_animate(chat_id):
+    dispatcher = scraper.dispatcher
+    if not COMMAND_ANIMATION or dispatcher is None or delivery_backlog() > COMMAND_ANIMATION_MAX_BACKLOG:
+        return False
+    command_bucket.refill()
+    if command_bucket.tokens < ANIMATION_RPCS:
+        return False
+    if not dispatcher.reserve(chat_id, ANIMATION_RPCS, keep=1):
+        return False
+    command_bucket.tokens -= ANIMATION_RPCS
+    return True
+
+async def play_animation(app, event, first_step):
+    chat_id = event.chat_id
+    try:
+        animation_message = await event.respond(first_step, parse_mode='html')
+        METRICS.inc("command_rpc_total", kind="animation")
+        for step in ANIMATION_STEPS:
+            await asyncio.sleep(0.3)
+            await app.edit_message(chat_id, animation_message, step, parse_mode='html')
+            METRICS.inc("command_rpc_total", kind="animation")
+        await asyncio.sleep(0.3)
+        await app.delete_messages(chat_id, animation_message)
+        METRICS.inc("command_rpc_total", kind="animation")
+    except FloodWaitError as e:
+        LOGGER.warning(f"Flood wait error during command animation in chat {chat_id}: {e.seconds} seconds", extra={"sample_key": f"command_flood_wait:{chat_id}"})
+        scraper.dispatcher.record_flood(chat_id, e.seconds)
+    except Exception as e:
+        LOGGER.warning(f"Command animation failed in chat {chat_id}: {e}", extra={"sample_key": f"command_animation_error:{chat_id}"})
+
+async def reply(event, text):
+    METRICS.inc("command_rpc_total", kind="reply")
+    if scraper.dispatcher is not None:
+        scraper.dispatcher.submit(
+            event.chat_id, text, buttons=UPDATES_BUTTONS, key=f"command:{event.id}",
+            priority=PRIORITY_COMMAND, link_preview=False
+        )
+        return
+    try:
+        await event.respond(text, parse_mode='md', buttons=UPDATES_BUTTONS, link_preview=False)
+    except FloodWaitError as e:
+        LOGGER.warning(f"Flood wait error: Waiting {e.seconds} seconds", extra={"sample_key": f"command_flood_wait:{event.chat_id}"})
+        await asyncio.sleep(e.seconds + 1)
+        await event.respond(text, parse_mode='md', buttons=UPDATES_BUTTONS, link_preview=False)
+
+def register_welcome_command(app: TelegramClient, names, label, animation_text, flag=" "):
+    pattern = '|'.join(rf'\{prefix}({"|".join(names)})$' for prefix in COMMAND_PREFIX)
+    @app.on(events.NewMessage(pattern=pattern, incoming=True))
+    async def welcome_message(event):
+        chat_id = event.chat_id
+        METRICS.inc("commands_total", command=label)
+        if not allow_command(event, label):
+            return
+        try:
+            with METRICS.timer("command_seconds", command=label):
+                if should_animate(chat_id):
+                    await play_animation(app, event, animation_text)
+                else:
+                    METRICS.inc("command_animation_skipped_total", command=label)
+                full_name = sender_name(event)
+                if event.is_private:
+                    response_text = render_private(full_name, flag)
+                else:
+                    response_text = render_group(await chat_title(event))
+                await reply(event, response_text)
+            LOGGER.info(f"Sent /{label} message to {full_name} (ID: {event.sender_id}) in chat {chat_id}", extra={"sample_key": f"command:{chat_id}"})
+        except Exception as e:
+            LOGGER.error(f"Error in /{label} handler for chat {chat_id}: {e}")
+    return welcome_message
@@ -0,0 +1,65 @@
+#Copyright @ISmartCoder
+#Updates Channel t.me/TheSmartDev
+import asyncio
+import time
+from utils import METRICS, DIGEST_WINDOW, DIGEST_THRESHOLD, DIGEST_MAX_ITEMS
+from modules.dispatcher import PRIORITY_OTP
+
+class DigestBuffer:
+    def __init__(self, dispatcher, format_single, format_digest, window=DIGEST_WINDOW, threshold=DIGEST_THRESHOLD, max_items=DIGEST_MAX_ITEMS):
+        self.dispatcher = dispatcher
+        self.format_single = format_single
+        self.format_digest = format_digest
+        self.window = window
+        self.threshold = max(threshold, 2)
+        self.max_items = max(max_items, self.threshold)
+        self.buffers = {}
+        self.timers = {}
+        self.last_flush = {}
+
+    def add(self, chat_id, key, sms):
+        now = time.monotonic()
+        buffer = self.buffers.get(chat_id)
+        if buffer is None and now - self.last_flush.get(chat_id, float("-inf")) >= self.window:
+            self.last_flush[chat_id] = now
+            self.send_single(chat_id, key, sms)
+            return
+        if buffer is None:
+            buffer = self.buffers[chat_id] = []
+            self.timers[chat_id] = asyncio.get_running_loop().call_later(self.window, self.flush, chat_id)
+        buffer.append((key, sms))
+        METRICS.set_gauge("digest_buffered", sum(len(items) for items in self.buffers.values()))
+        if len(buffer) >= self.max_items:
+            self.flush(chat_id)
+
+    def flush(self, chat_id):
+        timer = self.timers.pop(chat_id, None)
+        if timer is not None:
+            timer.cancel()
+        buffer = self.buffers.pop(chat_id, None)
+        METRICS.set_gauge("digest_buffered", sum(len(items) for items in self.buffers.values()))
+        if not buffer:
+            return
+        self.last_flush[chat_id] = time.monotonic()
+        if len(buffer) < self.threshold:
+            for key, sms in buffer:
+                self.send_single(chat_id, key, sms)
+            return
+        message, buttons = self.format_digest([sms for _, sms in buffer])
+        first_seen = min(sms.first_seen for _, sms in buffer)
+        members = [key for key, _ in buffer]
+        METRICS.inc("digest_messages_total")
+        METRICS.inc("digest_otps_total", len(buffer))
+        self.dispatcher.submit(
+            chat_id, message, buttons=buttons, key=f"digest:{members[0]}", priority=PRIORITY_OTP,
+            first_seen=first_seen, durable=True, members=members
+        )
+
+    def flush_all(self):
+        for chat_id in list(self.buffers):
+            self.flush(chat_id)
+
+    def send_single(self, chat_id, key, sms):
+        message, buttons = self.format_single(sms)
+        METRICS.inc("digest_singles_total")
+        self.dispatcher.submit(chat_id, message, buttons=buttons, key=key, first_seen=sms.first_seen, durable=True)
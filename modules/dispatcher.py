@@ -0,0 +1,183 @@
+#Copyright @ISmartCoder
+#Updates Channel t.me/TheSmartDev
+import asyncio
+import itertools
+import time
+from telethon import TelegramClient
+from telethon.errors import FloodWaitError, PeerIdInvalidError, ChatWriteForbiddenError
+from telethon.tl.types import InputPeerUser, InputPeerSelf
+from utils import LOGGER, METRICS, TokenBucket, SENT, FAILED, DELIVERY_WORKERS, DELIVERY_GLOBAL_RATE, DELIVERY_CHAT_RATE, DELIVERY_GROUP_RATE, DELIVERY_MAX_RETRIES, COMMAND_SEND_RATE, COMMAND_SEND_BURST
+
+PRIORITY_OTP = 0
+PRIORITY_NOTICE = 1
+PRIORITY_COMMAND = 2
+
+class Delivery:
+    __slots__ = ("chat_id", "text", "buttons", "key", "first_seen", "durable", "link_preview", "members", "attempts")
+
+    def __init__(self, chat_id, text, buttons=None, key=None, first_seen=None, durable=False, link_preview=True, members=None):
+        self.chat_id = chat_id
+        self.text = text
+        self.buttons = buttons
+        self.key = key
+        self.first_seen = first_seen
+        self.durable = durable
+        self.link_preview = link_preview
+        self.members = members
+        self.attempts = 0
+
+class Dispatcher:
+    def __init__(self, client: TelegramClient, workers=DELIVERY_WORKERS, outbox=None):
+        self.client = client
+        self.workers = workers
+        self.outbox = outbox
+        self.queue = asyncio.PriorityQueue()
+        self.sequence = itertools.count()
+        self.peers = {}
+        self.chat_buckets = {}
+        self.command_buckets = {}
+        self.global_bucket = TokenBucket(DELIVERY_GLOBAL_RATE, DELIVERY_GLOBAL_RATE)
+        self.flood_until = {}
+        self.pending = set()
+        self.tasks = []
+
+    def start(self):
+        if not self.tasks:
+            self.tasks = [asyncio.ensure_future(self.worker()) for _ in range(self.workers)]
+
+    async def stop(self):
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.tasks = []
+
+    def submit(self, chat_id, text, buttons=None, key=None, priority=PRIORITY_OTP, first_seen=None, durable=False, link_preview=True, members=None):
+        if key is not None:
+            if (chat_id, key) in self.pending:
+                METRICS.inc("telegram_coalesced_total")
+                return False
+            self.pending.add((chat_id, key))
+        self.put(priority, Delivery(chat_id, text, buttons, key, first_seen, durable, link_preview, members))
+        return True
+
+    def put(self, priority, delivery):
+        self.queue.put_nowait((priority, next(self.sequence), delivery))
+
+    def put_later(self, delay, priority, delivery):
+        asyncio.get_running_loop().call_later(delay, self.put, priority, delivery)
+
+    def finish(self, delivery, state=None, error=None):
+        if delivery.key is not None:
+            self.pending.discard((delivery.chat_id, delivery.key))
+        if state and delivery.durable and self.outbox is not None:
+            for key in delivery.members or (delivery.key,):
+                self.outbox.settle(key, state, delivery.attempts, error)
+
+    def chat_bucket(self, chat_id, priority=PRIORITY_OTP):
+        if priority == PRIORITY_COMMAND:
+            bucket = self.command_buckets.get(chat_id)
+            if bucket is None:
+                bucket = self.command_buckets[chat_id] = TokenBucket(COMMAND_SEND_RATE, COMMAND_SEND_BURST)
+            return bucket
+        bucket = self.chat_buckets.get(chat_id)
+        if bucket is None:
+            rate = DELIVERY_GROUP_RATE if self.is_group(chat_id) else DELIVERY_CHAT_RATE
+            bucket = self.chat_buckets[chat_id] = TokenBucket(rate - COMMAND_SEND_RATE)
+        return bucket
+
+    def is_group(self, chat_id):
+        peer = self.peers.get(chat_id)
+        if peer is not None:
+            return not isinstance(peer, (InputPeerUser, InputPeerSelf))
+        return not isinstance(chat_id, int) or chat_id < 0
+
+    def reserve(self, chat_id, tokens, keep=0, priority=PRIORITY_COMMAND):
+        now = time.monotonic()
+        if self.flood_until.get(chat_id, 0) > now:
+            return False
+        bucket = self.chat_bucket(chat_id, priority)
+        bucket.refill(now)
+        if bucket.tokens < tokens + keep:
+            return False
+        bucket.tokens -= tokens
+        return True
+
+    def record_flood(self, chat_id, seconds):
+        METRICS.inc("telegram_floodwait_total")
+        self.flood_until[chat_id] = time.monotonic() + seconds + 1
+
+    async def resolve_peer(self, chat_id):
+        peer = self.peers.get(chat_id)
+        if peer is None:
+            METRICS.inc("peer_cache_misses_total")
+            peer = self.peers[chat_id] = await self.client.get_input_entity(chat_id)
+            if not isinstance(chat_id, int):
+                self.chat_buckets.pop(chat_id, None)
+        return peer
+
+    async def resolve_peers(self, chat_ids):
+        chat_ids = list(dict.fromkeys(chat_ids))
+        results = await asyncio.gather(*(self.resolve_peer(chat_id) for chat_id in chat_ids), return_exceptions=True)
+        peers = {}
+        for chat_id, result in zip(chat_ids, results):
+            if isinstance(result, PeerIdInvalidError):
+                LOGGER.error(f"Invalid peer ID for chat {chat_id}")
+            elif isinstance(result, Exception):
+                LOGGER.error(f"Error checking chat {chat_id}: {result}")
+            else:
+                peers[chat_id] = result
+        return peers
+
+    async def worker(self):
+        while True:
+            priority, _, delivery = await self.queue.get()
+            try:
+                await self.deliver(priority, delivery)
+            except Exception as e:
+                LOGGER.error(f"Error delivering message to {delivery.chat_id}: {e}")
+                self.finish(delivery)
+            finally:
+                self.queue.task_done()
+
+    async def deliver(self, priority, delivery):
+        chat_id = delivery.chat_id
+        now = time.monotonic()
+        bucket = self.chat_bucket(chat_id, priority)
+        wait = max(self.flood_until.get(chat_id, 0) - now, bucket.delay(now))
+        if wait > 0:
+            self.put_later(wait, priority, delivery)
+            return
+        global_wait = self.global_bucket.delay()
+        if global_wait > 0:
+            await asyncio.sleep(global_wait)
+        self.global_bucket.consume()
+        bucket.consume()
+        try:
+            peer = await self.resolve_peer(chat_id)
+            with METRICS.timer("telegram_send_seconds"):
+                await self.client.send_message(peer, delivery.text, parse_mode='md', buttons=delivery.buttons, link_preview=delivery.link_preview)
+            METRICS.inc("telegram_sent_total")
+            if delivery.first_seen is not None:
+                METRICS.observe("otp_delivery_age_seconds", time.time() - delivery.first_seen)
+            delivery.attempts += 1
+            self.finish(delivery, SENT)
+        except FloodWaitError as e:
+            LOGGER.warning(f"Flood wait error for chat {chat_id}: Waiting {e.seconds} seconds", extra={"sample_key": f"flood_wait:{chat_id}"})
+            self.record_flood(chat_id, e.seconds)
+            self.put_later(e.seconds + 1, priority, delivery)
+        except ChatWriteForbiddenError:
+            LOGGER.error(f"Bot cannot send messages to chat {chat_id}: Write access forbidden")
+            self.finish(delivery, FAILED, "write forbidden")
+        except PeerIdInvalidError:
+            LOGGER.error(f"Invalid peer ID for chat {chat_id}")
+            self.peers.pop(chat_id, None)
+            self.finish(delivery, FAILED, "invalid peer")
+        except Exception as e:
+            delivery.attempts += 1
+            if delivery.attempts >= DELIVERY_MAX_RETRIES:
+                LOGGER.error(f"Giving up on message to chat {chat_id} after {delivery.attempts} attempts: {e}")
+                self.finish(delivery, FAILED, str(e))
+                return
+            LOGGER.warning(f"Error sending message to chat {chat_id}, retrying: {e}", extra={"sample_key": f"delivery_retry:{chat_id}"})
+            self.peers.pop(chat_id, None)
+            self.put_later(5 * delivery.attempts, priority, delivery)
@@ -1,92 +1,75 @@
 import asyncio
 import json
-import re
-import ssl
-import time
+import logging
 import os
+import sys
+import zlib
+import time
+from contextlib import aclosing
 from datetime import datetime
 import html
 import aiohttp
-import pycountry
-import brotli
-from bs4 import BeautifulSoup
 from telethon import TelegramClient
-from telethon.errors import FloodWaitError, PeerIdInvalidError, ChatWriteForbiddenError
 from telethon.tl.types import ReplyInlineMarkup, KeyboardButtonRow, InputKeyboardButtonUserProfile, KeyboardButtonCopy
 from telethon.tl.custom import Button
-from telethon.utils import get_display_name
-from utils import LOGGER, SERVICE_PATTERNS, COUNTRY_ALIASES, LOGIN_URL, SMS_LIST_URL, SMS_NUMBERS_URL, SMS_DETAILS_URL, SMS_HEADERS, OTP_HISTORY_FILE, SMS_CACHE_FILE
+from utils import LOGGER, LOGIN_URL, SMS_LIST_URL, SMS_NUMBERS_URL, SMS_DETAILS_URL, SMS_HEADERS, OTP_HISTORY_FILE, SMS_CACHE_FILE, SESSION_COOKIE_FILE, SESSION_TOKEN_FILE, OUTBOX_FILE, POLL_STATE_FILE, WARM_CACHE_FILE, WARM_CACHE_INTERVAL, FETCH_CONCURRENCY, STREAM_QUEUE_SIZE, STREAM_BATCH_SIZE, DIGEST_MODE, SmsCache, OtpHistory, PollState, PollScheduler, PortalSession, AuthExpired, is_auth_failure, parse_csrf_token, parse_ranges, parse_numbers, parse_sms_page, get_country_emoji, build_country_index, load_country_index, country_index, load_snapshot, save_snapshot, dump_peers, restore_peers, run_cpu, LoopLagMonitor, HealthTracker, Throttled, parse_retry_after, SubscriptionIndex, Outbox, SmsRecord, METRICS, WORKER_PIPE_LIMIT, start_metrics_server, dump_metrics, create_session, read_text, transport_stats
+from modules.dispatcher import Dispatcher, PRIORITY_NOTICE
+from modules.digest import DigestBuffer
 from config import EMAIL, PASSWORD, CHAT_IDS, OWNER_ID, UPDATE_CHANNEL_URL
 
-ssl._create_default_https_context = ssl._create_unverified_context
-file_lock = asyncio.Lock()
+try:
+    from config import ACCOUNTS
+except ImportError:
+    ACCOUNTS = [{"email": EMAIL, "password": PASSWORD}]
 
-def get_flag_emoji(country_code):
-    if not country_code or len(country_code) != 2:
-        return "🌍"
-    code_points = [ord(c.upper()) - ord('A') + 0x1F1E6 for c in country_code]
-    return chr(code_points[0]) + chr(code_points[1])
+fetch_semaphore = asyncio.Semaphore(FETCH_CONCURRENCY)
+sms_cache = SmsCache(SMS_CACHE_FILE)
+otp_history = OtpHistory(OTP_HISTORY_FILE)
+poll_state = PollState(POLL_STATE_FILE)
+outbox = Outbox(OUTBOX_FILE)
+warm_cache_file = WARM_CACHE_FILE
+portal_session = PortalSession()
+dispatcher = None
+digest = None
+credentials = {"email": EMAIL, "password": PASSWORD}
+shard_index = 0
+shard_count = 1
+poll_stats = {"errors": 0, "throttled": 0}
+unacked = {}
+poll_scheduler = PollScheduler()
+health = HealthTracker()
+routes = SubscriptionIndex(default_chats=CHAT_IDS)
+loop_lag = LoopLagMonitor()
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
-def get_country_emoji(country_name):
-    country_name = COUNTRY_ALIASES.get(country_name, country_name)
-    countries = pycountry.countries.search_fuzzy(country_name)
-    if countries:
-        return get_flag_emoji(countries[0].alpha_2)
-    return "🌍"
-
-async def load_sms_cache():
-    async with file_lock:
-        if os.path.exists(SMS_CACHE_FILE):
-            with open(SMS_CACHE_FILE, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        return {}
-
-async def save_sms_cache(cache):
-    async with file_lock:
-        with open(SMS_CACHE_FILE, 'w', encoding='utf-8') as f:
-            json.dump(cache, f, indent=4)
-
-async def load_otp_history():
-    async with file_lock:
-        if os.path.exists(OTP_HISTORY_FILE):
-            with open(OTP_HISTORY_FILE, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        return {}
-
-async def save_otp_history(history):
-    async with file_lock:
-        with open(OTP_HISTORY_FILE, 'w', encoding='utf-8') as f:
-            json.dump(history, f, indent=4)
-
-async def check_and_save_otp(number, otp, message_id):
-    history = await load_otp_history()
-    current_time = datetime.now().isoformat()
-    if number not in history:
-        history[number] = [{"otp": otp, "message_id": message_id, "timestamp": current_time}]
-        await save_otp_history(history)
-        return True
-    for entry in history[number]:
-        if entry["otp"] == otp and entry["message_id"] != message_id:
-            entry_time = datetime.fromisoformat(entry["timestamp"])
-            if (datetime.now() - entry_time).total_seconds() < 60:
-                return False
-    history[number].append({"otp": otp, "message_id": message_id, "timestamp": current_time})
-    await save_otp_history(history)
-    return True
+def worker_path(path, label):
+    root, ext = os.path.splitext(path)
+    return f"{root}.{label}{ext}"
+
+def use_account(account_index, account, index=0, count=1):
+    global sms_cache, poll_state, portal_session, shard_index, shard_count
+    label = f"{account_index}-{index}"
+    credentials["email"] = account["email"]
+    credentials["password"] = account["password"]
+    shard_index = index
+    shard_count = count
+    sms_cache = SmsCache(worker_path(SMS_CACHE_FILE, label))
+    poll_state = PollState(worker_path(POLL_STATE_FILE, label))
+    portal_session = PortalSession(worker_path(SESSION_COOKIE_FILE, label), worker_path(SESSION_TOKEN_FILE, label))
+
+def in_shard(range_name):
+    return shard_count == 1 or zlib.crc32(range_name.encode('utf-8')) % shard_count == shard_index
 
 def format_otp_with_spaces(otp):
     return otp
 
 async def get_csrf_token(session):
     try:
-        async with session.get(LOGIN_URL, timeout=10) as response:
-            response.raise_for_status()
-            text = await response.text()
-            soup = BeautifulSoup(text, 'html.parser')
-            csrf_input = soup.find('input', {'name': '_token'})
-            if csrf_input is None:
-                return None
-            csrf_token = csrf_input.get('value')
+        with METRICS.timer("portal_csrf_seconds"):
+            async with session.get(LOGIN_URL, timeout=10) as response:
+                response.raise_for_status()
+                text = await read_text(response)
+            csrf_token = parse_csrf_token(text)
             if not csrf_token:
                 return None
             return csrf_token
@@ -104,355 +87,575 @@ async def login(session, attempt=1):
             return await login(session, attempt + 1)
         login_data = {
             "_token": csrf_token,
-            "email": EMAIL,
-            "password": PASSWORD
+            "email": credentials["email"],
+            "password": credentials["password"]
         }
-        async with session.post(LOGIN_URL, data=login_data, timeout=30) as login_response:
-            login_response.raise_for_status()
-            if "dashboard" in str(login_response.url) or login_response.status == 200:
-                return True
-            await asyncio.sleep(10)
-            return await login(session, attempt + 1)
+        METRICS.inc("portal_logins_total")
+        with METRICS.timer("portal_login_seconds"):
+            async with session.post(LOGIN_URL, data=login_data, timeout=30) as login_response:
+                login_response.raise_for_status()
+                logged_in = "dashboard" in str(login_response.url) or login_response.status == 200
+        if logged_in:
+            portal_session.update(session, await get_csrf_token(session))
+            return True
+        await asyncio.sleep(10)
+        return await login(session, attempt + 1)
     except Exception as e:
         LOGGER.error(f"Login error: {e}")
         await asyncio.sleep(10)
         return await login(session, attempt + 1)
 
-async def refresh_session(session, last_login_time):
-    current_time = time.time()
-    if current_time - last_login_time >= 1800:
-        if await login(session):
-            return True, current_time
-        return False, last_login_time
-    return True, last_login_time
+async def ensure_csrf_token(session):
+    if portal_session.token:
+        return portal_session.token
+    if await login(session):
+        return portal_session.token
+    return None
 
-async def fetch_sms(session):
+async def portal_post(session, url, headers, payload, label, stage):
+    while True:
+        try:
+            async with fetch_semaphore:
+                with METRICS.timer("portal_fetch_seconds", stage=stage):
+                    async with session.post(url, headers=headers, data=payload, timeout=30) as response:
+                        if is_auth_failure(response):
+                            portal_session.invalidate()
+                            METRICS.inc("portal_auth_expired_total")
+                            raise AuthExpired(f"Portal session expired while fetching {label} (HTTP {response.status})")
+                        if response.status == 429:
+                            METRICS.inc("portal_throttled_total", stage=stage)
+                            raise Throttled(f"Too Many Requests (429) for {label}", parse_retry_after(response.headers.get("Retry-After")))
+                        response.raise_for_status()
+                        return await read_text(response)
+        except aiohttp.ClientResponseError as e:
+            if e.status < 500 or not health.take_retry():
+                raise
+            METRICS.inc("portal_retries_total", stage=stage)
+            LOGGER.warning(f"Retrying {label} after HTTP {e.status}", extra={"sample_key": f"portal_retry:{label}"})
+        except (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError, asyncio.TimeoutError) as e:
+            if not health.take_retry():
+                raise
+            METRICS.inc("portal_retries_total", stage=stage)
+            LOGGER.warning(f"Retrying {label} after {type(e).__name__}", extra={"sample_key": f"portal_retry:{label}"})
+
+async def parse_page(stage, parser, text):
+    with METRICS.timer("parse_seconds", stage=stage):
+        return await run_cpu(parser, text)
+
+async def fetch_sms_list(session, csrf_token):
+    headers = SMS_HEADERS.copy()
+    headers["X-CSRF-TOKEN"] = csrf_token
+    payload = f"_token={csrf_token}&from=&to="
+    return await portal_post(session, SMS_LIST_URL, headers, payload, "SMS list", "list")
+
+async def fetch_sms(session, queue):
     try:
-        csrf_token = await get_csrf_token(session)
+        csrf_token = await ensure_csrf_token(session)
         if not csrf_token:
-            if await login(session):
-                csrf_token = await get_csrf_token(session)
+            poll_stats["errors"] += 1
+            return
+        try:
+            response_text = await fetch_sms_list(session, csrf_token)
+        except AuthExpired:
+            csrf_token = await ensure_csrf_token(session)
             if not csrf_token:
-                return []
-        
-        headers = SMS_HEADERS.copy()
-        headers["X-CSRF-TOKEN"] = csrf_token
-        payload = f"_token={csrf_token}&from=&to="
-        
-        async with session.post(SMS_LIST_URL, headers=headers, data=payload, timeout=30) as response:
-            response.raise_for_status()
-            content_encoding = response.headers.get('Content-Encoding', '')
-            if content_encoding == 'br' and brotli:
-                content = await response.read()
-                response_text = brotli.decompress(content).decode('utf-8')
-            else:
-                response_text = await response.text()
-        
-        soup = BeautifulSoup(response_text, 'html.parser')
-        items = soup.find_all('div', class_='item')
-        sms_list = []
-        sms_cache = await load_sms_cache()
+                poll_stats["errors"] += 1
+                return
+            response_text = await fetch_sms_list(session, csrf_token)
         
-        for item in items:
-            try:
-                range_name = item.find('div', class_='col-sm-4')
-                range_name = range_name.text.strip() if range_name else "Unknown"
-                count = item.find('p', string=re.compile(r'^\d+$'))
-                count = count.text if count else "0"
-                
-                numbers = await fetch_numbers(session, range_name, csrf_token)
-                
-                for num in numbers:
-                    try:
-                        sms_details = await fetch_sms_details(session, num, range_name, csrf_token)
-                        message_id = f"{num}_{sms_details.get('message', '')[:50]}"
-                        if message_id in sms_cache:
-                            continue
-                        
-                        country_name = extract_country(range_name)
-                        country_emoji = get_country_emoji(country_name)
-                        sms_entry = {
-                            "range": range_name,
-                            "count": count,
-                            "country": country_name,
-                            "country_emoji": country_emoji,
-                            "service": sms_details.get('service', 'Unknown'),
-                            "number": num,
-                            "otp": extract_otp(sms_details.get('message', '')),
-                            "full_message": sms_details.get('message', 'No message available'),
-                            "message_id": message_id
-                        }
-                        sms_list.append(sms_entry)
-                        sms_cache[message_id] = {"timestamp": datetime.now().isoformat()}
-                        await save_sms_cache(sms_cache)
-                    except Exception as e:
-                        LOGGER.error(f"Error processing number {num}: {e}")
-                        continue
-            except Exception as e:
-                LOGGER.error(f"Error processing item: {e}")
-                continue
-        
-        return sms_list
+        ranges = [(range_name, count) for range_name, count in await parse_page("list", parse_ranges, response_text) if in_shard(range_name)]
+        sms_cache.evict()
+        poll_state.observe(ranges)
+        deferred = health.start_cycle([range_name for range_name, _ in ranges])
+        tasks = []
+        cooling = 0
+        for range_name, count in ranges:
+            retry = deferred.get(range_name)
+            if not health.allow("range", range_name):
+                cooling += 1
+                if retry:
+                    health.defer(range_name, retry)
+            elif poll_state.range_changed(range_name, count):
+                tasks.append(fetch_range(session, range_name, count, csrf_token, queue))
+            elif retry:
+                tasks.append(fetch_range_numbers(session, range_name, count, csrf_token, queue, sorted(retry)))
+        METRICS.inc("ranges_skipped_total", len(ranges) - len(tasks) - cooling)
+        METRICS.inc("ranges_cooling_total", cooling)
+        METRICS.inc("ranges_fetched_total", len(tasks))
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        if any(isinstance(result, AuthExpired) for result in results):
+            LOGGER.warning("Portal session expired mid-cycle, logging in again")
+            if not await ensure_csrf_token(session):
+                poll_stats["errors"] += 1
+            return
+        portal_session.maybe_save(session)
+    except Throttled as e:
+        LOGGER.warning(f"{e}, backing off the poll loop")
+        poll_stats["throttled"] += 1
     except Exception as e:
         LOGGER.error(f"Error in fetch_sms: {e}")
-        return []
+        poll_stats["errors"] += 1
+
+async def produce_sms(session, queue):
+    await fetch_sms(session, queue)
+    await queue.put(None)
+
+async def stream_sms(session):
+    queue = asyncio.Queue(maxsize=STREAM_QUEUE_SIZE)
+    producer = asyncio.ensure_future(produce_sms(session, queue))
+    try:
+        while True:
+            sms = await queue.get()
+            batch = []
+            while sms is not None:
+                batch.append(sms)
+                if len(batch) >= STREAM_BATCH_SIZE or queue.empty():
+                    break
+                sms = queue.get_nowait()
+            if batch:
+                yield batch
+            if sms is None:
+                break
+    finally:
+        producer.cancel()
+
+async def collect_sms(session):
+    return [sms async for batch in stream_sms(session) for sms in batch]
+
+async def fetch_range(session, range_name, count, csrf_token, queue):
+    try:
+        numbers = await fetch_numbers(session, range_name, csrf_token)
+        if numbers is None:
+            return
+        poll_state.commit_range(range_name, count)
+        await fetch_range_numbers(session, range_name, count, csrf_token, queue, numbers)
+    except AuthExpired:
+        raise
+    except Exception as e:
+        LOGGER.error(f"Error processing range {range_name}: {e}")
+
+async def fetch_range_numbers(session, range_name, count, csrf_token, queue, numbers):
+    results = await asyncio.gather(
+        *(fetch_number(session, num, range_name, count, csrf_token, queue) for num in numbers),
+        return_exceptions=True
+    )
+    failed = [num for num, result in zip(numbers, results) if result is not True]
+    if failed:
+        health.defer(range_name, failed)
+        METRICS.inc("numbers_deferred_total", len(failed))
+    expired = [result for result in results if isinstance(result, AuthExpired)]
+    if expired:
+        raise expired[0]
+    if len(failed) * 2 >= len(numbers) > 0:
+        if health.failure("range", range_name):
+            LOGGER.warning(f"{len(failed)}/{len(numbers)} numbers failed, cooling down range {range_name}", extra={"sample_key": f"range_cooling:{range_name}"})
+    else:
+        health.success("range", range_name)
+
+async def fetch_number(session, num, range_name, count, csrf_token, queue):
+    if not (health.allow("range", range_name) and health.allow("number", num)):
+        return False
+    sms_details = await fetch_sms_details(session, num, range_name, csrf_token)
+    if sms_details is None:
+        return False
+    try:
+        message_id = f"{num}_{sms_details.get('message', '')[:50]}"
+        if poll_state.seen(num, message_id):
+            return True
+        if message_id in sms_cache:
+            METRICS.inc("sms_cache_hits_total")
+            poll_state.mark_seen(num, message_id)
+            return True
+        METRICS.inc("sms_cache_misses_total")
+        
+        country_name = extract_country(range_name)
+        country_emoji = get_country_emoji(country_name)
+        sms_entry = SmsRecord(
+            range_name,
+            count,
+            country_name,
+            country_emoji,
+            sms_details.get('service', 'Unknown'),
+            num,
+            sms_details.get('otp', 'No OTP found'),
+            sms_details.get('message', 'No message available'),
+            message_id
+        )
+        await queue.put(sms_entry)
+        return True
+    except Exception as e:
+        LOGGER.error(f"Error processing number {num}: {e}", extra={"sample_key": f"number_error:{num}"})
+        return False
 
 async def fetch_numbers(session, range_name, csrf_token):
     try:
         headers = SMS_HEADERS.copy()
         headers["X-CSRF-TOKEN"] = csrf_token
         payload = f"_token={csrf_token}&start=&end=&range={range_name}"
-        async with session.post(SMS_NUMBERS_URL, headers=headers, data=payload, timeout=30) as response:
-            response.raise_for_status()
-            content_encoding = response.headers.get('Content-Encoding', '')
-            if content_encoding == 'br' and brotli:
-                content = await response.read()
-                response_text = brotli.decompress(content).decode('utf-8')
-            else:
-                response_text = await response.text()
-            soup = BeautifulSoup(response_text, 'html.parser')
-            number_divs = soup.find_all('div', class_='col-sm-4')
-            return [div.text.strip() for div in number_divs if div.text.strip()]
+        response_text = await portal_post(session, SMS_NUMBERS_URL, headers, payload, f"range {range_name}", "numbers")
+        return await parse_page("numbers", parse_numbers, response_text)
+    except AuthExpired:
+        raise
+    except Throttled as e:
+        if health.failure("range", range_name, e.retry_after):
+            LOGGER.warning(f"{e}, cooling down range {range_name}", extra={"sample_key": f"range_cooling:{range_name}"})
+        return None
     except Exception as e:
-        LOGGER.error(f"Error fetching numbers: {e}")
-        return []
+        LOGGER.error(f"Error fetching numbers: {e}", extra={"sample_key": f"numbers_error:{range_name}"})
+        health.failure("range", range_name)
+        return None
 
 async def fetch_sms_details(session, number, range_name, csrf_token):
-    max_retries = 3
-    delay = 5
-    for attempt in range(max_retries):
-        try:
-            headers = SMS_HEADERS.copy()
-            headers["X-CSRF-TOKEN"] = csrf_token
-            payload = f"_token={csrf_token}&start=&end=&Number={number}&Range={range_name}"
-            async with session.post(SMS_DETAILS_URL, headers=headers, data=payload, timeout=30) as response:
-                response.raise_for_status()
-                content_encoding = response.headers.get('Content-Encoding', '')
-                if content_encoding == 'br' and brotli:
-                    content = await response.read()
-                    response_text = brotli.decompress(content).decode('utf-8')
-                else:
-                    response_text = await response.text()
-                soup = BeautifulSoup(response_text, 'html.parser')
-                message_divs = soup.select('div.col-9.col-sm-6 p.mb-0.pb-0')
-                messages = [div.text.strip() for div in message_divs] if message_divs else ["No message found"]
-                service_div = soup.find('div', class_='col-sm-4')
-                service = service_div.text.strip().replace('CLI', '').strip() if service_div else "Unknown"
-                
-                sms_details = []
-                for message in messages:
-                    service_from_message = extract_service(message)
-                    if service_from_message != "Unknown":
-                        service = service_from_message
-                    sms_details.append({"message": message, "service": service})
-                
-                return sms_details[0] if sms_details else {"message": "No message found", "service": "Unknown"}
-        except aiohttp.ClientResponseError as e:
-            if e.status == 429:
-                LOGGER.warning(f"Too Many Requests (429) on attempt {attempt + 1} for {number}, retrying in {delay} seconds")
-                await asyncio.sleep(delay)
-                delay = min(delay * 2, 60)
-                continue
-            LOGGER.error(f"Error fetching SMS details for {number}: {e}")
-            return {"message": "No message found", "service": "Unknown"}
-        except Exception as e:
-            LOGGER.error(f"Error fetching SMS details for {number}: {e}")
-            return {"message": "No message found", "service": "Unknown"}
-    LOGGER.error(f"Failed to fetch SMS details for {number} after {max_retries} retries")
-    return {"message": "No message found", "service": "Unknown"}
+    try:
+        headers = SMS_HEADERS.copy()
+        headers["X-CSRF-TOKEN"] = csrf_token
+        payload = f"_token={csrf_token}&start=&end=&Number={number}&Range={range_name}"
+        response_text = await portal_post(session, SMS_DETAILS_URL, headers, payload, number, "details")
+        sms_details = await parse_page("details", parse_sms_page, response_text)
+        health.success("number", number)
+        return sms_details
+    except AuthExpired:
+        raise
+    except Throttled as e:
+        health.failure("number", number, e.retry_after)
+        return None
+    except Exception as e:
+        LOGGER.error(f"Error fetching SMS details for {number}: {e}", extra={"sample_key": f"details_error:{number}"})
+        health.failure("number", number)
+        return None
 
 def extract_country(range_name):
     country = range_name.split()[0].capitalize() if range_name and len(range_name.split()) > 1 else "Unknown"
     return country
 
-def extract_service(message):
-    for service, pattern in SERVICE_PATTERNS.items():
-        if re.search(pattern, message, re.IGNORECASE):
-            return service
-    return "Unknown"
+def format_sms(sms):
+    timestamp = datetime.now().strftime("%H:%M:%S")
+    date = datetime.now().strftime("%d-%m-%Y")
+    country_emoji = sms.country_emoji
+    country = html.escape(sms.country)
+    service = html.escape(sms.service)
+    formatted_otp = html.escape(format_otp_with_spaces(sms.otp))
+    number = html.escape(sms.number)
+    full_message = html.escape(sms.full_message)
+    message = (
+        f"**{country_emoji} {country} SMS OTP Received Successfully ✅**\n"
+        "**━━━━━━━━━━━━━━━━━━━━━━━**\n"
+        f"**⚡️ OTP Code :** `{formatted_otp}`\n"
+        f"**⏰ Time:** `{timestamp}`\n"
+        f"**📅 Date:** `{date}`\n"
+        f"**💰 Service:** `{service}`\n"
+        f"**💸 Payment:** `Paid`\n"
+        f"**🔍 Phone Number:** `{number}`\n"
+        f"**❤️ OTP Message :** `{full_message}`\n"
+        "**━━━━━━━━━━━━━━━━━━━━━━━**\n"
+        "**Note: Don't Spam Here Just Wait Else Ban 🚫**"
+    )
+    buttons = ReplyInlineMarkup([
+        KeyboardButtonRow([
+            KeyboardButtonCopy("Copy OTP Code 🗒", formatted_otp)
+        ])
+    ])
+    return message, buttons
 
-def extract_otp(text):
-    match = re.search(r'\b(\d{4,6}|\d{3}\s\d{3})\b|verification code: (\w+)', text, re.IGNORECASE)
-    return match.group(0) if match else "No OTP found"
+def format_digest(batch):
+    timestamp = datetime.now().strftime("%H:%M:%S")
+    date = datetime.now().strftime("%d-%m-%Y")
+    lines = []
+    rows = []
+    for sms in batch:
+        country = html.escape(sms.country)
+        service = html.escape(sms.service)
+        formatted_otp = format_otp_with_spaces(sms.otp)
+        number = html.escape(sms.number)
+        lines.append(f"**{sms.country_emoji} {country} · {service}**\n`{number}` ➜ `{html.escape(formatted_otp)}`")
+        rows.append(KeyboardButtonRow([
+            KeyboardButtonCopy(f"🗒 {formatted_otp} · {sms.service}"[:64], formatted_otp)
+        ]))
+    message = (
+        f"**📦 {len(batch)} SMS OTPs Received Successfully ✅**\n"
+        "**━━━━━━━━━━━━━━━━━━━━━━━**\n"
+        + "\n".join(lines) + "\n"
+        "**━━━━━━━━━━━━━━━━━━━━━━━**\n"
+        f"**⏰ Time:** `{timestamp}` **📅 Date:** `{date}`\n"
+        "**Note: Don't Spam Here Just Wait Else Ban 🚫**"
+    )
+    return message, ReplyInlineMarkup(rows)
 
-async def send_sms_to_telegram(client, sms):
-    try:
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        date = datetime.now().strftime("%d-%m-%Y")
-        country_emoji = sms['country_emoji']
-        country = html.escape(sms['country'])
-        service = html.escape(sms['service'])
-        formatted_otp = html.escape(format_otp_with_spaces(sms['otp']))
-        number = html.escape(sms['number'])
-        full_message = html.escape(sms['full_message'])
-        message = (
-            f"**{country_emoji} {country} SMS OTP Received Successfully ✅**\n"
-            "**━━━━━━━━━━━━━━━━━━━━━━━**\n"
-            f"**⚡️ OTP Code :** `{formatted_otp}`\n"
-            f"**⏰ Time:** `{timestamp}`\n"
-            f"**📅 Date:** `{date}`\n"
-            f"**💰 Service:** `{service}`\n"
-            f"**💸 Payment:** `Paid`\n"
-            f"**🔍 Phone Number:** `{number}`\n"
-            f"**❤️ OTP Message :** `{full_message}`\n"
-            "**━━━━━━━━━━━━━━━━━━━━━━━**\n"
-            "**Note: Don't Spam Here Just Wait Else Ban 🚫**"
-        )
-        tasks = []
-        for chat_id in CHAT_IDS:
-            try:
-                await client.get_entity(chat_id)
-                tasks.append(client.send_message(
-                    chat_id,
-                    message,
-                    parse_mode='md',
-                    buttons=ReplyInlineMarkup([
-                        KeyboardButtonRow([
-                            KeyboardButtonCopy("Copy OTP Code 🗒", formatted_otp)
-                        ])
-                    ])
-                ))
-            except ChatWriteForbiddenError:
-                LOGGER.error(f"Bot cannot send messages to chat {chat_id}: Write access forbidden")
-            except PeerIdInvalidError:
-                LOGGER.error(f"Invalid peer ID for chat {chat_id}")
-            except Exception as e:
-                LOGGER.error(f"Error checking chat {chat_id}: {e}")
-        await asyncio.gather(*tasks, return_exceptions=True)
-    except FloodWaitError as e:
-        LOGGER.warning(f"Flood wait error: Waiting {e.seconds} seconds")
-        await asyncio.sleep(e.seconds + 1)
-        tasks = []
-        for chat_id in CHAT_IDS:
-            try:
-                await client.get_entity(chat_id)
-                tasks.append(client.send_message(
-                    chat_id,
-                    message,
-                    parse_mode='md',
-                    buttons=ReplyInlineMarkup([
-                        KeyboardButtonRow([
-                            KeyboardButtonCopy("Copy OTP Code 🗒", formatted_otp)
-                        ])
-                    ])
-                ))
-            except ChatWriteForbiddenError:
-                LOGGER.error(f"Bot cannot send messages to chat {chat_id}: Write access forbidden")
-            except PeerIdInvalidError:
-                LOGGER.error(f"Invalid peer ID for chat {chat_id}")
-            except Exception as e:
-                LOGGER.error(f"Error checking chat {chat_id}: {e}")
-        await asyncio.gather(*tasks, return_exceptions=True)
-    except PeerIdInvalidError:
-        LOGGER.error(f"Chat not found: {CHAT_IDS}")
-    except Exception as e:
-        LOGGER.error(f"Error sending OTP message: {e}")
+def send_sms_to_telegram(dispatcher, sms):
+    chats = routes.chats_for(sms.country, sms.service)
+    if not chats:
+        METRICS.inc("otp_unrouted_total")
+        return
+    with METRICS.timer("outbox_write_seconds"):
+        keys = outbox.enqueue(sms, chats)
+    if not keys:
+        return
+    if digest is not None:
+        for chat_id, key in keys:
+            digest.add(chat_id, key, sms)
+        return
+    message, buttons = format_sms(sms)
+    for chat_id, key in keys:
+        dispatcher.submit(chat_id, message, buttons=buttons, key=key, first_seen=sms.first_seen, durable=True)
+
+def resume_outbox(dispatcher):
+    pending = outbox.pending()
+    for key, chat_id, sms in pending:
+        if digest is not None:
+            digest.add(chat_id, key, sms)
+            continue
+        message, buttons = format_sms(sms)
+        dispatcher.submit(chat_id, message, buttons=buttons, key=key, first_seen=sms.first_seen, durable=True)
+    if pending:
+        LOGGER.info(f"Resumed {len(pending)} pending deliveries from the outbox")
+
+def format_start_alert():
+    timestamp = datetime.now().strftime("%H:%M:%S")
+    date = datetime.now().strftime("%d-%m-%Y")
+    return (
+        "**Smart OTP Bot Started Successfully ✅**\n"
+        "**━━━━━━━━━━━━━━━━━━━━━━**\n"
+        f"**⏰ Time:** `{timestamp}`\n"
+        f"**📅 Date:** `{date}`\n"
+        "**💰 Traffic:** Running.....📡\n"
+        "**📩 Otp Scrapper:** Running...🔍\n"
+        "**━━━━━━━━━━━━━━━━━━━━━━**\n"
+        "**Don't Spam Here Just Wait For OTP ❌**"
+    )
 
 async def send_start_alert(client):
     try:
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        date = datetime.now().strftime("%d-%m-%Y")
-        message = (
-            "**Smart OTP Bot Started Successfully ✅**\n"
-            "**━━━━━━━━━━━━━━━━━━━━━━**\n"
-            f"**⏰ Time:** `{timestamp}`\n"
-            f"**📅 Date:** `{date}`\n"
-            "**💰 Traffic:** Running.....📡\n"
-            "**📩 Otp Scrapper:** Running...🔍\n"
-            "**━━━━━━━━━━━━━━━━━━━━━━**\n"
-            "**Don't Spam Here Just Wait For OTP ❌**"
-        )
-        user_name = get_display_name(await client.get_entity(OWNER_ID))
-        tasks = []
-        recipients = CHAT_IDS + [OWNER_ID]
-        for chat_id in recipients:
-            try:
-                if chat_id in CHAT_IDS:
-                    await client.get_entity(chat_id)
-                tasks.append(client.send_message(
-                    chat_id,
-                    message,
-                    parse_mode='md',
-                    buttons=ReplyInlineMarkup([
-                        KeyboardButtonRow([
-                            InputKeyboardButtonUserProfile("👨🏻‍💻 Developer", await client.get_input_entity(OWNER_ID)),
-                            Button.url("Updates Channel", UPDATE_CHANNEL_URL)
-                        ])
-                    ])
-                ))
-            except ChatWriteForbiddenError:
-                LOGGER.error(f"Bot cannot send messages to chat {chat_id}: Write access forbidden")
-            except PeerIdInvalidError:
-                LOGGER.error(f"Invalid peer ID for chat {chat_id}")
-            except Exception as e:
-                LOGGER.error(f"Error checking chat {chat_id}: {e}")
-        await asyncio.gather(*tasks, return_exceptions=True)
-    except FloodWaitError as e:
-        LOGGER.warning(f"Flood wait error: Waiting {e.seconds} seconds")
-        await asyncio.sleep(e.seconds + 1)
-        tasks = []
-        for chat_id in recipients:
-            try:
-                if chat_id in CHAT_IDS:
-                    await client.get_entity(chat_id)
-                tasks.append(client.send_message(
-                    chat_id,
-                    message,
-                    parse_mode='md',
-                    buttons=ReplyInlineMarkup([
-                        KeyboardButtonRow([
-                            InputKeyboardButtonUserProfile("👨🏻‍💻 Developer", await client.get_input_entity(OWNER_ID)),
-                            Button.url("Updates Channel", UPDATE_CHANNEL_URL)
-                        ])
-                    ])
-                ))
-            except ChatWriteForbiddenError:
-                LOGGER.error(f"Bot cannot send messages to chat {chat_id}: Write access forbidden")
-            except PeerIdInvalidError:
-                LOGGER.error(f"Invalid peer ID for chat {chat_id}")
-            except Exception as e:
-                LOGGER.error(f"Error checking chat {chat_id}: {e}")
-        await asyncio.gather(*tasks, return_exceptions=True)
-    except PeerIdInvalidError:
-        LOGGER.error(f"Chat not found: {recipients}")
+        message = format_start_alert()
+        with METRICS.timer("startup_peer_resolve_seconds"):
+            peers = await dispatcher.resolve_peers([OWNER_ID, *CHAT_IDS])
+        row = [Button.url("Updates Channel", UPDATE_CHANNEL_URL)]
+        if OWNER_ID in peers:
+            row.insert(0, InputKeyboardButtonUserProfile("👨🏻‍💻 Developer", peers[OWNER_ID]))
+        buttons = ReplyInlineMarkup([KeyboardButtonRow(row)])
+        for chat_id in CHAT_IDS + [OWNER_ID]:
+            if chat_id in peers:
+                dispatcher.submit(chat_id, message, buttons=buttons, key="start_alert", priority=PRIORITY_NOTICE)
+        save_warm_cache()
     except Exception as e:
         LOGGER.error(f"Error sending start alert: {e}")
 
+def restore_warm_cache(snapshot):
+    countries = snapshot.get("countries")
+    if countries:
+        load_country_index(countries)
+    else:
+        build_country_index()
+    if dispatcher is not None:
+        dispatcher.peers.update(restore_peers(snapshot.get("peers")))
+
+def save_warm_cache():
+    save_snapshot({
+        "countries": country_index,
+        "peers": dump_peers(dispatcher.peers) if dispatcher is not None else {}
+    }, warm_cache_file)
+
+async def warm_cache_loop(interval=WARM_CACHE_INTERVAL):
+    while interval:
+        await asyncio.sleep(interval)
+        save_warm_cache()
+
+def mark_handled(sms_list):
+    with METRICS.timer("dedup_seconds", store="sms_cache"):
+        for sms in sms_list:
+            poll_state.mark_seen(sms.number, sms.message_id)
+            sms_cache.add(sms.message_id)
+
+def commit_sms(sms_list):
+    with METRICS.timer("dedup_seconds", store="otp_history"):
+        otp_history.commit(sms_list)
+    mark_handled(sms_list)
+
+async def poll_once(session, commit=True):
+    started = time.monotonic()
+    errors, throttled = poll_stats["errors"], poll_stats["throttled"]
+    connections, wire_bytes = transport_stats["connections"], transport_stats["wire_bytes"]
+    found = 0
+    delivered = 0
+    poll_state.begin_cycle()
+    try:
+        async for batch in stream_sms(session):
+            found += len(batch)
+            with METRICS.timer("dedup_seconds", store="otp_history"):
+                fresh = otp_history.filter_new([
+                    sms for sms in batch
+                    if sms.full_message != "No message found" and sms.otp != "No OTP found"
+                ])
+            fresh_ids = {sms.message_id for sms in fresh}
+            mark_handled([sms for sms in batch if sms.message_id not in fresh_ids])
+            for sms in fresh:
+                if not delivered:
+                    METRICS.observe("time_to_first_otp_seconds", time.monotonic() - started)
+                delivered += 1
+                yield sms
+            if commit:
+                commit_sms(fresh)
+    except BaseException:
+        poll_state.rollback()
+        raise
+    METRICS.set_gauge("cycle_connections", transport_stats["connections"] - connections)
+    METRICS.set_gauge("cycle_wire_bytes", transport_stats["wire_bytes"] - wire_bytes)
+    METRICS.observe("poll_cycle_seconds", time.monotonic() - started)
+    poll_state.forget({sms.range for sms in unacked.values()})
+    poll_state.save(exclude=health.deferred)
+    cycle_health = health.snapshot()
+    METRICS.set_gauge("open_breakers", len(cycle_health["open"]))
+    METRICS.set_gauge("deferred_numbers", cycle_health["deferred"])
+    if cycle_health["open"]:
+        LOGGER.info(f"Portal health: {cycle_health}")
+    if poll_stats["errors"] > errors or poll_stats["throttled"] > throttled:
+        poll_scheduler.record_failure()
+    else:
+        interval = poll_scheduler.interval
+        if poll_scheduler.observe(poll_state.observed) != interval:
+            LOGGER.info(f"Poll schedule: {poll_scheduler.schedule()}")
+    if found:
+        LOGGER.info(f"Found {found} new SMS messages, {delivered} new OTPs")
+    else:
+        LOGGER.info("No new SMS messages found")
+
+async def relay_worker_logs(stream, label):
+    while True:
+        try:
+            line = await stream.readline()
+        except ValueError:
+            continue
+        if not line:
+            return
+        try:
+            entry = json.loads(line)
+            if "metrics" in entry:
+                METRICS.merge_worker(label, entry["metrics"])
+                continue
+            level, message = logging.getLevelName(entry["level"]), entry["msg"]
+        except (ValueError, KeyError, TypeError):
+            level, message = logging.INFO, line.decode('utf-8', errors='replace').rstrip()
+        if not isinstance(level, int):
+            level = logging.INFO
+        LOGGER.log(level, f"[worker {label}] {message}")
+
+async def stop_worker(process, label):
+    if process.returncode is not None:
+        return
+    process.terminate()
+    try:
+        await asyncio.wait_for(process.wait(), 10)
+    except asyncio.TimeoutError:
+        LOGGER.warning(f"Scraper worker {label} did not stop, killing it")
+        process.kill()
+        await process.wait()
+
+async def run_worker_process(process, label):
+    while True:
+        try:
+            line = await process.stdout.readline()
+        except ValueError as e:
+            LOGGER.warning(f"Skipped oversized line from worker {label}: {e}")
+            continue
+        if not line:
+            break
+        try:
+            sms = SmsRecord.from_dict(json.loads(line))
+        except (ValueError, TypeError, AttributeError, KeyError) as e:
+            LOGGER.warning(f"Skipped malformed line from worker {label}: {e}")
+            continue
+        LOGGER.info(f"Sending OTP for {sms.number}: {sms.otp}", extra={"sample_key": f"otp_send:{sms.number}"})
+        try:
+            send_sms_to_telegram(dispatcher, sms)
+        except Exception as e:
+            LOGGER.error(f"Could not queue OTP {sms.message_id} from worker {label}: {e}")
+            continue
+        try:
+            process.stdin.write((json.dumps(sms.message_id, ensure_ascii=False) + "\n").encode())
+            await process.stdin.drain()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+    return await process.wait()
+
+async def supervise_worker(account_index, index, count):
+    label = f"{account_index}-{index}"
+    while True:
+        process = await asyncio.create_subprocess_exec(
+            sys.executable, "-m", "modules.worker",
+            "--account", str(account_index), "--shard", str(index), "--shards", str(count),
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            limit=WORKER_PIPE_LIMIT,
+            cwd=PROJECT_ROOT
+        )
+        LOGGER.info(f"Started scraper worker {label} (pid {process.pid})")
+        logs = asyncio.ensure_future(relay_worker_logs(process.stderr, label))
+        code = None
+        try:
+            code = await run_worker_process(process, label)
+        except Exception as e:
+            LOGGER.error(f"Scraper worker {label} pipe failed: {e}")
+        finally:
+            await stop_worker(process, label)
+            await asyncio.wait([logs], timeout=1)
+            logs.cancel()
+        LOGGER.error(f"Scraper worker {label} exited with code {code}, restarting in 10 seconds")
+        await asyncio.sleep(10)
+
 def setup_otp_handler(app: TelegramClient):
+    global dispatcher, digest
+    dispatcher = Dispatcher(app, outbox=outbox)
+    digest = DigestBuffer(dispatcher, format_sms, format_digest) if DIGEST_MODE else None
+    routes.load()
+    shards = [
+        (account_index, index, account.get("shards", 1))
+        for account_index, account in enumerate(ACCOUNTS)
+        for index in range(account.get("shards", 1))
+    ]
+
+    async def run_supervisor():
+        restore_warm_cache(load_snapshot(warm_cache_file))
+        outbox.open()
+        dispatcher.start()
+        asyncio.ensure_future(send_start_alert(app))
+        resume_outbox(dispatcher)
+        loop_lag.start()
+        await start_metrics_server()
+        asyncio.ensure_future(dump_metrics())
+        asyncio.ensure_future(warm_cache_loop())
+        await asyncio.gather(*(supervise_worker(*shard) for shard in shards))
+
     async def run_sms_monitor():
-        async with aiohttp.ClientSession() as session:
-            await send_start_alert(app)
-            last_login_time = time.time()
-            if await login(session):
+        restore_warm_cache(load_snapshot(warm_cache_file))
+        sms_cache.load()
+        poll_state.load()
+        otp_history.open()
+        outbox.open()
+        dispatcher.start()
+        asyncio.ensure_future(send_start_alert(app))
+        resume_outbox(dispatcher)
+        loop_lag.start()
+        await start_metrics_server()
+        asyncio.ensure_future(dump_metrics())
+        asyncio.ensure_future(warm_cache_loop())
+        async with create_session() as session:
+            if portal_session.restore(session) or await login(session):
                 LOGGER.info("Login successful, starting monitoring...")
                 while True:
                     try:
-                        success, last_login_time = await refresh_session(session, last_login_time)
-                        if not success:
-                            LOGGER.error("Session refresh failed, retrying...")
-                            await asyncio.sleep(10)
-                            continue
-                        sms_list = await fetch_sms(session)
-                        if sms_list:
-                            LOGGER.info(f"Found {len(sms_list)} new SMS messages")
-                            for i in range(0, len(sms_list), 20):
-                                batch = sms_list[i:i+20]
-                                tasks = []
-                                for sms in batch:
-                                    if sms['full_message'] != "No message found" and sms['otp'] != "No OTP found":
-                                        if await check_and_save_otp(sms['number'], sms['otp'], sms['message_id']):
-                                            LOGGER.info(f"Sending OTP for {sms['number']}: {sms['otp']}")
-                                            tasks.append(send_sms_to_telegram(app, sms))
-                                await asyncio.gather(*tasks, return_exceptions=True)
-                                if i + 20 < len(sms_list):
-                                    LOGGER.info("Processed batch, waiting 3 seconds...")
-                                    await asyncio.sleep(3)
-                        else:
-                            LOGGER.info("No new SMS messages found")
-                        await asyncio.sleep(5)
+                        async with aclosing(poll_once(session)) as polled:
+                            async for sms in polled:
+                                LOGGER.info(f"Sending OTP for {sms.number}: {sms.otp}", extra={"sample_key": f"otp_send:{sms.number}"})
+                                send_sms_to_telegram(dispatcher, sms)
                     except Exception as e:
                         LOGGER.error(f"Error in main loop: {e}")
-                        await asyncio.sleep(10)
+                        poll_scheduler.record_failure()
+                    await asyncio.sleep(poll_scheduler.next_delay())
             else:
                 LOGGER.error("Initial login failed")
-    app.loop.create_task(run_sms_monitor())
\ No newline at end of file
+
+    if len(shards) > 1:
+        LOGGER.info(f"Starting supervisor with {len(shards)} scraper workers")
+        app.loop.create_task(run_supervisor())
+    else:
+        app.loop.create_task(run_sms_monitor())
\ No newline at end of file
@@ -0,0 +1,48 @@
+#Copyright @ISmartCoder
+#Updates Channel t.me/TheSmartDev
+from telethon import TelegramClient, events
+from utils import LOGGER, WILDCARD
+from config import COMMAND_PREFIX, OWNER_ID
+import modules.scraper as scraper
+
+def parse_route(args):
+    parts = (args or "").split(maxsplit=1)
+    country = parts[0] if parts else WILDCARD
+    service = parts[1] if len(parts) > 1 else WILDCARD
+    return country, service
+
+def format_routes(keys):
+    if not keys:
+        return "**No subscriptions, this chat receives no OTPs.**"
+    lines = [f"• `{country}` / `{service}`" for country, service in keys]
+    return "**Subscriptions (country / service):**\n" + "\n".join(lines)
+
+def setup_subscribe_handler(app: TelegramClient):
+    scraper.routes.load()
+    prefixes = '|'.join(rf'\{prefix}' for prefix in COMMAND_PREFIX)
+    pattern = rf'(?:{prefixes})(sub|unsub|subs)(?:\s+(.+))?$'
+    @app.on(events.NewMessage(pattern=pattern, incoming=True))
+    async def subscribe_message(event):
+        try:
+            if event.sender_id != OWNER_ID:
+                return
+            chat_id = event.chat_id
+            command, args = event.pattern_match.group(1), event.pattern_match.group(2)
+            if command == "sub":
+                country, service = parse_route(args)
+                if scraper.routes.subscribe(chat_id, country, service):
+                    response_text = f"**Subscribed this chat to `{country}` / `{service}` OTPs ✅**"
+                else:
+                    response_text = f"**This chat is already subscribed to `{country}` / `{service}`**"
+            elif command == "unsub":
+                if args:
+                    removed = scraper.routes.unsubscribe(chat_id, *parse_route(args))
+                else:
+                    removed = scraper.routes.unsubscribe(chat_id)
+                response_text = f"**Removed {removed} subscription(s) from this chat**"
+            else:
+                response_text = format_routes(scraper.routes.describe(chat_id))
+            await event.respond(response_text, parse_mode='md')
+            LOGGER.info(f"Handled /{command} {args or ''} from owner in chat {chat_id}")
+        except Exception as e:
+            LOGGER.error(f"Error in /sub handler: {e}")
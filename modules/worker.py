@@ -0,0 +1,82 @@
+#Copyright @ISmartCoder
+#Updates Channel t.me/TheSmartDev
+import argparse
+import asyncio
+import json
+import logging
+import sys
+from contextlib import aclosing
+from utils import LOGGER, METRICS, WORKER_METRICS_INTERVAL, configure_logging, dump_metrics, create_session, load_snapshot
+import modules.scraper as scraper
+
+def emit(sms):
+    scraper.unacked[sms.message_id] = sms
+    sys.stdout.write(json.dumps(sms.to_dict(), ensure_ascii=False) + "\n")
+    sys.stdout.flush()
+
+async def report_metrics(handler, interval=WORKER_METRICS_INTERVAL):
+    while True:
+        await asyncio.sleep(interval)
+        line = json.dumps({"metrics": METRICS.snapshot()}, ensure_ascii=False)
+        handler.acquire()
+        try:
+            handler.stream.write(line + "\n")
+            handler.flush()
+        finally:
+            handler.release()
+
+async def read_acks():
+    reader = asyncio.StreamReader()
+    await asyncio.get_running_loop().connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+    while True:
+        line = await reader.readline()
+        if not line:
+            return
+        try:
+            sms = scraper.unacked.pop(json.loads(line), None)
+        except json.JSONDecodeError:
+            continue
+        if sms is not None:
+            scraper.commit_sms([sms])
+
+async def run_worker(account_index, shard_index, shard_count, handler=None):
+    scraper.use_account(account_index, scraper.ACCOUNTS[account_index], shard_index, shard_count)
+    scraper.sms_cache.load()
+    scraper.poll_state.load()
+    scraper.otp_history.open()
+    scraper.restore_warm_cache(load_snapshot(scraper.warm_cache_file))
+    asyncio.ensure_future(dump_metrics())
+    if handler is not None:
+        asyncio.ensure_future(report_metrics(handler))
+    acks = asyncio.ensure_future(read_acks())
+    async with create_session() as session:
+        if not (scraper.portal_session.restore(session) or await scraper.login(session)):
+            LOGGER.error(f"Initial login failed for account {account_index}")
+            return 1
+        LOGGER.info(f"Worker {account_index}-{shard_index} logged in, starting monitoring...")
+        while not acks.done():
+            try:
+                async with aclosing(scraper.poll_once(session, commit=False)) as polled:
+                    async for sms in polled:
+                        emit(sms)
+            except BrokenPipeError:
+                break
+            except Exception as e:
+                LOGGER.error(f"Error in worker loop: {e}")
+                scraper.poll_scheduler.record_failure()
+            await asyncio.wait([acks], timeout=scraper.poll_scheduler.next_delay())
+    LOGGER.warning(f"Supervisor went away, stopping worker {account_index}-{shard_index}")
+    return 0
+
+def main():
+    parser = argparse.ArgumentParser(description="Scraper worker for one portal account shard")
+    parser.add_argument("--account", type=int, default=0)
+    parser.add_argument("--shard", type=int, default=0)
+    parser.add_argument("--shards", type=int, default=1)
+    args = parser.parse_args()
+    handler = logging.StreamHandler()
+    configure_logging(fmt="json", handlers=[handler])
+    sys.exit(asyncio.run(run_worker(args.account, args.shard, args.shards, handler)))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#Copyright @ISmartCoder
+#Updates Channel t.me/TheSmartDev
+import json
+import os
+import re
+import pytest
+from utils.otp import NO_OTP, UNKNOWN_SERVICE, analyze_message, classify_service, extract_otp
+from utils.service import SERVICE_PATTERNS
+
+CORPUS = os.path.join(os.path.dirname(__file__), os.pardir, "benchmarks", "otp_corpus.jsonl")
+
+def load_corpus():
+    with open(CORPUS, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def legacy_extract_service(message):
+    for service, pattern in SERVICE_PATTERNS.items():
+        if re.search(pattern, message, re.IGNORECASE):
+            return service
+    return UNKNOWN_SERVICE
+
+@pytest.mark.parametrize("text, service, otp", [
+    ("Your WhatsApp code: 482-913\n\nDon't share this code with others", "WhatsApp", "482-913"),
+    ("482 913 is your Instagram code. Don't share it.", "Instagram", "482 913"),
+    ("G-482913 is your Google verification code.", "Google", "482913"),
+    ("FB-30574 is your Facebook confirmation code", "Facebook", "30574"),
+    ("Reply to +8801712345 if 482913 is your Facebook password reset code", "Facebook", "482913"),
+    ("Telegram code 40391", "Telegram", "40391"),
+    ("Login code: 71264. Do not give this code to anyone, even if they say they are from Telegram!", "Telegram", "71264"),
+])
+def test_service_rules(text, service, otp):
+    assert analyze_message(text) == (service, otp)
+
+@pytest.mark.parametrize("text, otp", [
+    ("Your OTP for login is 482913. Valid for 10 minutes.", "482913"),
+    ("Call 01712345678 now, 730215 is your Grab code", "730215"),
+    ("Mã xác thực của bạn là 482913", "482913"),
+    ("Your order 99182233 is ready. Your code: 5521", "5521"),
+    ("Your verification code: A7K2QX", "A7K2QX"),
+    ("Your code for Chrome on Windows: 4829", "4829"),
+])
+def test_generic_rules(text, otp):
+    assert extract_otp(text) == otp
+
+@pytest.mark.parametrize("text, otp", [
+    ("Amazon: 550123 Don't share.", "550123"),
+    ("Apple 2025: 730215", "730215"),
+    ("Security alert 482913", "482913"),
+    ("Your balance is 1250 BDT as of 12/10/2025.", NO_OTP),
+    ("Happy 2025! Recharge 199 and get 2GB free.", NO_OTP),
+    ("Uber trip on 12/10: 45.50 BDT", NO_OTP),
+])
+def test_fallback(text, otp):
+    assert extract_otp(text) == otp
+
+def test_service_hint():
+    assert extract_otp("Code 123-456", "WhatsApp") == "123-456"
+    assert analyze_message("Code 123-456", "WhatsApp") == (UNKNOWN_SERVICE, "123-456")
+    assert analyze_message("", "Telegram") == ("Telegram", NO_OTP)
+
+@pytest.mark.parametrize("text", [
+    "Tu código es 482913",
+    "Please sign in to netflix.com",
+    "verify your whatsapp on telegram",
+    "metadata for tg bot",
+    "",
+])
+def test_classification_matches_pattern_loop(text):
+    assert classify_service(text) == legacy_extract_service(text)
+
+def test_corpus():
+    records = load_corpus()
+    for record in records:
+        assert classify_service(record["message"]) == legacy_extract_service(record["message"])
+    correct = sum(1 for record in records if extract_otp(record["message"]) == (record["otp"] or NO_OTP))
+    assert correct / len(records) >= 0.95
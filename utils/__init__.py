@@ -1,6 +1,23 @@
 #Copyright @ISmartCoder
 #Updates Channel t.me/TheSmartDev
-from .logger import LOGGER
-from .service import SERVICE_PATTERNS
+from .logger import LOGGER, configure_logging, log_counts
+from .service import SERVICE_PATTERNS, SERVICE_PRIORITY
 from .cntry import COUNTRY_ALIASES
-from .helper import LOGIN_URL, SMS_LIST_URL, SMS_NUMBERS_URL, SMS_DETAILS_URL, SMS_HEADERS, OTP_HISTORY_FILE, SMS_CACHE_FILE
\ No newline at end of file
+from .helper import LOGIN_URL, SMS_LIST_URL, SMS_NUMBERS_URL, SMS_DETAILS_URL, SMS_HEADERS, OTP_HISTORY_FILE, SMS_CACHE_FILE, SESSION_COOKIE_FILE, SESSION_TOKEN_FILE, OUTBOX_FILE, POLL_STATE_FILE, WARM_CACHE_FILE, WARM_CACHE_INTERVAL, FETCH_CONCURRENCY, STREAM_QUEUE_SIZE, STREAM_BATCH_SIZE, DELIVERY_WORKERS, DELIVERY_GLOBAL_RATE, DELIVERY_CHAT_RATE, DELIVERY_GROUP_RATE, DELIVERY_MAX_RETRIES, WORKER_METRICS_INTERVAL, WORKER_PIPE_LIMIT, DIGEST_MODE, DIGEST_WINDOW, DIGEST_THRESHOLD, DIGEST_MAX_ITEMS, COMMAND_USER_RATE, COMMAND_SEND_RATE, COMMAND_SEND_BURST, COMMAND_GLOBAL_RATE, COMMAND_CHAT_CACHE_TTL, COMMAND_ANIMATION, COMMAND_ANIMATION_MAX_BACKLOG
+from .smscache import SmsCache
+from .otpstore import OtpHistory
+from .pollstate import PollState
+from .extract import parse_csrf_token, parse_ranges, parse_numbers, parse_sms_details, parse_sms_page, set_parser_backend
+from .session import PortalSession, AuthExpired, is_auth_failure
+from .ratelimit import TokenBucket
+from .flags import get_flag_emoji, get_country_emoji, build_country_index, load_country_index, country_index
+from .otp import NO_OTP, UNKNOWN_SERVICE, classify_service, extract_otp, analyze_message
+from .scheduler import PollScheduler
+from .executor import run_cpu, configure_executor, LoopLagMonitor
+from .metrics import METRICS, start_metrics_server, dump_metrics
+from .transport import create_session, read_text, transport_stats
+from .health import HealthTracker, CircuitBreaker, Throttled, parse_retry_after
+from .routing import SubscriptionIndex, WILDCARD
+from .outbox import Outbox, outbox_key, PENDING, SENT, FAILED
+from .record import SmsRecord
+from .snapshot import load_snapshot, save_snapshot, dump_peers, restore_peers
\ No newline at end of file
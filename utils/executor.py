@@ -0,0 +1,80 @@
+#Copyright @ISmartCoder
+#Updates Channel t.me/TheSmartDev
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from .logger import LOGGER
+from .helper import PARSE_EXECUTOR, PARSE_WORKERS, LOOP_LAG_INTERVAL, LOOP_LAG_REPORT_INTERVAL
+
+executor_kind = PARSE_EXECUTOR
+executor_workers = PARSE_WORKERS
+executor = None
+
+def configure_executor(kind, workers=PARSE_WORKERS):
+    global executor_kind, executor_workers, executor
+    if executor is not None:
+        executor.shutdown(wait=False)
+    executor_kind = kind
+    executor_workers = workers
+    executor = None
+
+def get_executor():
+    global executor
+    if executor is None and executor_kind != "inline":
+        if executor_kind == "process":
+            executor = ProcessPoolExecutor(max_workers=executor_workers)
+        else:
+            executor = ThreadPoolExecutor(max_workers=executor_workers, thread_name_prefix="parse")
+    return executor
+
+async def run_cpu(func, *args):
+    pool = get_executor()
+    if pool is None:
+        return func(*args)
+    return await asyncio.get_running_loop().run_in_executor(pool, func, *args)
+
+class LoopLagMonitor:
+    def __init__(self, interval=LOOP_LAG_INTERVAL, report_interval=LOOP_LAG_REPORT_INTERVAL):
+        self.interval = interval
+        self.report_interval = report_interval
+        self.task = None
+        self.reset()
+
+    def reset(self):
+        self.samples = 0
+        self.total = 0.0
+        self.max_lag = 0.0
+
+    def start(self):
+        if self.task is None:
+            self.task = asyncio.ensure_future(self.run())
+        return self.task
+
+    def stop(self):
+        if self.task is not None:
+            self.task.cancel()
+            self.task = None
+
+    def record(self, lag):
+        self.samples += 1
+        self.total += lag
+        self.max_lag = max(self.max_lag, lag)
+
+    def snapshot(self):
+        return {
+            "samples": self.samples,
+            "mean_ms": round(self.total / self.samples * 1000, 2) if self.samples else 0.0,
+            "max_ms": round(self.max_lag * 1000, 2),
+        }
+
+    async def run(self):
+        last_report = time.monotonic()
+        while True:
+            started = time.monotonic()
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            self.record(max(now - started - self.interval, 0.0))
+            if self.report_interval and now - last_report >= self.report_interval:
+                LOGGER.info(f"Event loop lag: {self.snapshot()}")
+                self.reset()
+                last_report = now
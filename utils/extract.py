@@ -0,0 +1,148 @@
+#Copyright @ISmartCoder
+#Updates Channel t.me/TheSmartDev
+import functools
+import importlib.util
+import re
+from .logger import LOGGER
+from .helper import PARSER_BACKEND
+from .otp import UNKNOWN_SERVICE, analyze_message
+
+COUNT_PATTERN = re.compile(r'^\d+$')
+LXML_AVAILABLE = importlib.util.find_spec("lxml") is not None
+
+def make_soup(text):
+    from bs4 import BeautifulSoup
+    return BeautifulSoup(text, 'html.parser')
+
+def bs4_csrf_token(text):
+    soup = make_soup(text)
+    csrf_input = soup.find('input', {'name': '_token'})
+    return csrf_input.get('value') if csrf_input is not None else None
+
+def bs4_ranges(text):
+    soup = make_soup(text)
+    ranges = []
+    for item in soup.find_all('div', class_='item'):
+        range_name = item.find('div', class_='col-sm-4')
+        range_name = range_name.text.strip() if range_name else "Unknown"
+        count = item.find('p', string=COUNT_PATTERN)
+        count = count.text if count else "0"
+        ranges.append((range_name, count))
+    return ranges
+
+def bs4_numbers(text):
+    soup = make_soup(text)
+    number_divs = soup.find_all('div', class_='col-sm-4')
+    return [div.text.strip() for div in number_divs if div.text.strip()]
+
+def bs4_sms_details(text):
+    soup = make_soup(text)
+    message_divs = soup.select('div.col-9.col-sm-6 p.mb-0.pb-0')
+    messages = [div.text.strip() for div in message_divs]
+    service_div = soup.find('div', class_='col-sm-4')
+    return messages, service_div.text if service_div else None
+
+def has_class(name):
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+@functools.lru_cache(maxsize=None)
+def lxml_xpaths():
+    from lxml import etree
+    return {
+        "csrf": etree.XPath("//input[@name='_token']"),
+        "item": etree.XPath(f"//div[{has_class('item')}]"),
+        "range_name": etree.XPath(f".//div[{has_class('col-sm-4')}]"),
+        "column": etree.XPath(f"//div[{has_class('col-sm-4')}]"),
+        "message": etree.XPath(
+            f"//div[{has_class('col-9')} and {has_class('col-sm-6')}]//p[{has_class('mb-0')} and {has_class('pb-0')}]"
+        ),
+    }
+
+if LXML_AVAILABLE:
+    def lxml_document(text):
+        if not text or not text.strip():
+            return None
+        import lxml.html
+        return lxml.html.document_fromstring(text)
+
+    def lxml_csrf_token(text):
+        document = lxml_document(text)
+        if document is None:
+            return None
+        inputs = lxml_xpaths()["csrf"](document)
+        return inputs[0].get('value') if inputs else None
+
+    def lxml_ranges(text):
+        document = lxml_document(text)
+        if document is None:
+            return []
+        xpaths = lxml_xpaths()
+        ranges = []
+        for item in xpaths["item"](document):
+            range_name = xpaths["range_name"](item)
+            range_name = range_name[0].text_content().strip() if range_name else "Unknown"
+            count = "0"
+            for p in item.iter('p'):
+                if len(p) == 0 and p.text and COUNT_PATTERN.search(p.text):
+                    count = p.text
+                    break
+            ranges.append((range_name, count))
+        return ranges
+
+    def lxml_numbers(text):
+        document = lxml_document(text)
+        if document is None:
+            return []
+        numbers = (div.text_content().strip() for div in lxml_xpaths()["column"](document))
+        return [number for number in numbers if number]
+
+    def lxml_sms_details(text):
+        document = lxml_document(text)
+        if document is None:
+            return [], None
+        xpaths = lxml_xpaths()
+        messages = [p.text_content().strip() for p in xpaths["message"](document)]
+        service_div = xpaths["column"](document)
+        return messages, service_div[0].text_content() if service_div else None
+
+PARSERS = {
+    "bs4": (bs4_csrf_token, bs4_ranges, bs4_numbers, bs4_sms_details),
+}
+if LXML_AVAILABLE:
+    PARSERS["lxml"] = (lxml_csrf_token, lxml_ranges, lxml_numbers, lxml_sms_details)
+
+def resolve_backend(name):
+    if name == "auto":
+        return "lxml" if "lxml" in PARSERS else "bs4"
+    if name not in PARSERS:
+        LOGGER.warning(f"HTML parser backend {name} is not available, falling back to bs4")
+        return "bs4"
+    return name
+
+active_backend = resolve_backend(PARSER_BACKEND)
+
+def set_parser_backend(name):
+    global active_backend
+    active_backend = resolve_backend(name)
+    return active_backend
+
+def parse_csrf_token(text):
+    return PARSERS[active_backend][0](text)
+
+def parse_ranges(text):
+    return PARSERS[active_backend][1](text)
+
+def parse_numbers(text):
+    return PARSERS[active_backend][2](text)
+
+def parse_sms_details(text):
+    return PARSERS[active_backend][3](text)
+
+def parse_sms_page(text):
+    messages, service_text = parse_sms_details(text)
+    message = messages[0] if messages else "No message found"
+    service = service_text.strip().replace('CLI', '').strip() if service_text is not None else UNKNOWN_SERVICE
+    service_from_message, otp = analyze_message(message, service)
+    if service_from_message != UNKNOWN_SERVICE:
+        service = service_from_message
+    return {"message": message, "service": service, "otp": otp}
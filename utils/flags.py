@@ -0,0 +1,68 @@
+#Copyright @ISmartCoder
+#Updates Channel t.me/TheSmartDev
+import functools
+import unicodedata
+from .cntry import COUNTRY_ALIASES
+from .helper import COUNTRY_CACHE_SIZE
+
+DEFAULT_FLAG = "🌍"
+COUNTRY_FIELDS = ("alpha_2", "alpha_3", "numeric", "name", "official_name", "common_name")
+country_index = {}
+
+def get_flag_emoji(country_code):
+    if not country_code or len(country_code) != 2:
+        return DEFAULT_FLAG
+    code_points = [ord(c.upper()) - ord('A') + 0x1F1E6 for c in country_code]
+    return chr(code_points[0]) + chr(code_points[1])
+
+def normalize_country(name):
+    name = name.strip().lower()
+    if name.isascii():
+        return name
+    return "".join(c for c in unicodedata.normalize("NFKD", name) if not unicodedata.combining(c))
+
+def build_country_index():
+    import pycountry
+    index = {}
+    for country in pycountry.countries:
+        for field in COUNTRY_FIELDS:
+            value = getattr(country, field, None)
+            if value:
+                index.setdefault(value.lower(), country.alpha_2)
+                index.setdefault(normalize_country(value), country.alpha_2)
+    for alias, name in COUNTRY_ALIASES.items():
+        code = index.get(normalize_country(name)) or fuzzy_country_code(normalize_country(name))
+        if code:
+            index[normalize_country(alias)] = code
+    country_index.clear()
+    country_index.update(index)
+    return country_index
+
+def load_country_index(index):
+    country_index.clear()
+    country_index.update(index)
+    return country_index
+
+@functools.lru_cache(maxsize=COUNTRY_CACHE_SIZE)
+def fuzzy_country_code(name):
+    import pycountry
+    try:
+        countries = pycountry.countries.search_fuzzy(name)
+    except LookupError:
+        return None
+    return countries[0].alpha_2 if countries else None
+
+def get_country_code(country_name):
+    if not country_name:
+        return None
+    if not country_index:
+        build_country_index()
+    country_name = COUNTRY_ALIASES.get(country_name, country_name)
+    code = country_index.get(country_name.lower())
+    if code is None:
+        key = normalize_country(country_name)
+        code = country_index.get(key) or fuzzy_country_code(key)
+    return code
+
+def get_country_emoji(country_name):
+    return get_flag_emoji(get_country_code(country_name))
@@ -0,0 +1,96 @@
+#Copyright @ISmartCoder
+#Updates Channel t.me/TheSmartDev
+import time
+from .helper import HEALTH_RANGE_THRESHOLD, HEALTH_NUMBER_THRESHOLD, HEALTH_COOLDOWN, HEALTH_MAX_COOLDOWN, RETRY_BUDGET
+
+class Throttled(Exception):
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+def parse_retry_after(value):
+    try:
+        return max(float(value), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+class CircuitBreaker:
+    def __init__(self, threshold, cooldown=HEALTH_COOLDOWN, max_cooldown=HEALTH_MAX_COOLDOWN):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.failures = 0
+        self.open_until = 0.0
+
+    def allow(self, now=None):
+        now = now if now is not None else time.monotonic()
+        return now >= self.open_until
+
+    def record_success(self):
+        self.failures = 0
+        self.open_until = 0.0
+
+    def record_failure(self, retry_after=None, now=None):
+        now = now if now is not None else time.monotonic()
+        self.failures += 1
+        if self.failures < self.threshold:
+            return False
+        delay = min(self.cooldown * 2 ** (self.failures - self.threshold), self.max_cooldown)
+        self.open_until = now + max(delay, retry_after or 0.0)
+        return True
+
+class HealthTracker:
+    def __init__(self, range_threshold=HEALTH_RANGE_THRESHOLD, number_threshold=HEALTH_NUMBER_THRESHOLD,
+                 cooldown=HEALTH_COOLDOWN, max_cooldown=HEALTH_MAX_COOLDOWN, retry_budget=RETRY_BUDGET):
+        self.thresholds = {"range": range_threshold, "number": number_threshold}
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.retry_budget = retry_budget
+        self.budget = retry_budget
+        self.breakers = {}
+        self.deferred = {}
+
+    def breaker(self, kind, key):
+        breaker = self.breakers.get((kind, key))
+        if breaker is None:
+            breaker = self.breakers[(kind, key)] = CircuitBreaker(self.thresholds[kind], self.cooldown, self.max_cooldown)
+        return breaker
+
+    def start_cycle(self, ranges):
+        self.budget = self.retry_budget
+        for range_name in set(self.deferred) - set(ranges):
+            del self.deferred[range_name]
+        deferred, self.deferred = self.deferred, {}
+        return deferred
+
+    def allow(self, kind, key, now=None):
+        breaker = self.breakers.get((kind, key))
+        return breaker is None or breaker.allow(now)
+
+    def success(self, kind, key):
+        breaker = self.breakers.pop((kind, key), None)
+        if breaker is not None:
+            breaker.record_success()
+
+    def failure(self, kind, key, retry_after=None, now=None):
+        return self.breaker(kind, key).record_failure(retry_after, now)
+
+    def take_retry(self):
+        if self.budget <= 0:
+            return False
+        self.budget -= 1
+        return True
+
+    def defer(self, range_name, numbers):
+        self.deferred.setdefault(range_name, set()).update(numbers)
+
+    def open_breakers(self, now=None):
+        now = now if now is not None else time.monotonic()
+        return sorted(f"{kind}:{key}" for (kind, key), breaker in self.breakers.items() if not breaker.allow(now))
+
+    def snapshot(self):
+        return {
+            "budget_left": self.budget,
+            "open": self.open_breakers(),
+            "deferred": sum(len(numbers) for numbers in self.deferred.values())
+        }
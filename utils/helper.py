@@ -9,8 +9,73 @@ SMS_HEADERS = {
     "Referer": "https://www.ivasms.com/portal/sms/received",
     "Content-Type": "application/x-www-form-urlencoded; charset=UTF-8",
     "Accept": "text/html, */*; q=0.01",
-    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
-    "Accept-Encoding": "gzip, deflate"
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
 }
-OTP_HISTORY_FILE = "otp_history.json"
+OTP_HISTORY_FILE = "otp_history.db"
+OTP_DUPLICATE_WINDOW = 60
 SMS_CACHE_FILE = "sms_cache.json"
+SMS_CACHE_TTL = 172800
+SMS_CACHE_COMPACT_EVERY = 1000
+FETCH_CONCURRENCY = 8
+PARSER_BACKEND = "auto"
+SESSION_COOKIE_FILE = "session_cookies.json"
+SESSION_TOKEN_FILE = "session_token.json"
+SESSION_SAVE_INTERVAL = 300
+DELIVERY_WORKERS = 4
+DELIVERY_GLOBAL_RATE = 25
+DELIVERY_CHAT_RATE = 1
+DELIVERY_GROUP_RATE = 20 / 60
+DELIVERY_MAX_RETRIES = 3
+DIGEST_MODE = False
+DIGEST_WINDOW = 5
+DIGEST_THRESHOLD = 2
+DIGEST_MAX_ITEMS = 10
+COUNTRY_CACHE_SIZE = 1024
+POLL_INTERVAL = 5
+POLL_MIN_INTERVAL = 1
+POLL_MAX_INTERVAL = 5
+POLL_HOT_WINDOW = 60
+POLL_ERROR_DELAY = 10
+POLL_MAX_ERROR_DELAY = 120
+PARSE_EXECUTOR = "thread"
+PARSE_WORKERS = 2
+LOOP_LAG_INTERVAL = 0.1
+LOOP_LAG_REPORT_INTERVAL = 300
+METRICS_HOST = "127.0.0.1"
+METRICS_PORT = None
+METRICS_DUMP_INTERVAL = 300
+WORKER_METRICS_INTERVAL = 15
+WORKER_PIPE_LIMIT = 1048576
+HTTP_POOL_LIMIT = 32
+HTTP_POOL_LIMIT_PER_HOST = 8
+HTTP_KEEPALIVE_TIMEOUT = 75
+HTTP_DNS_TTL = 300
+HTTP_READ_CHUNK = 16384
+STREAM_QUEUE_SIZE = 100
+STREAM_BATCH_SIZE = 20
+HEALTH_RANGE_THRESHOLD = 3
+HEALTH_NUMBER_THRESHOLD = 1
+HEALTH_COOLDOWN = 5
+HEALTH_MAX_COOLDOWN = 120
+RETRY_BUDGET = 10
+SUBSCRIPTIONS_FILE = "subscriptions.json"
+LOG_FILE = "botlog.txt"
+LOG_MAX_BYTES = 50000000
+LOG_BACKUP_COUNT = 10
+LOG_FORMAT = "text"
+LOG_MODE = "full"
+LOG_SAMPLE_WINDOW = 60
+LOG_SAMPLE_BURST = 5
+LOG_SAMPLE_KEYS = 4096
+OUTBOX_FILE = "outbox.db"
+OUTBOX_RETENTION = 86400
+POLL_STATE_FILE = "poll_state.json"
+WARM_CACHE_FILE = "warm_cache.json"
+WARM_CACHE_INTERVAL = 300
+COMMAND_USER_RATE = 1 / 10
+COMMAND_SEND_RATE = 4 / 60
+COMMAND_SEND_BURST = 4
+COMMAND_GLOBAL_RATE = 5
+COMMAND_CHAT_CACHE_TTL = 3600
+COMMAND_ANIMATION = True
+COMMAND_ANIMATION_MAX_BACKLOG = 0
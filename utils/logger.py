@@ -1,20 +1,110 @@
 #Copyright @ISmartCoder
-#Updates Channel t.me/TheSmartDev 
+#Updates Channel t.me/TheSmartDev
+import atexit
+import json
 import logging
-from logging.handlers import RotatingFileHandler
+import queue
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
+from .helper import LOG_FILE, LOG_MAX_BYTES, LOG_BACKUP_COUNT, LOG_FORMAT, LOG_MODE, LOG_SAMPLE_WINDOW, LOG_SAMPLE_BURST, LOG_SAMPLE_KEYS
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s", 
-    datefmt='%Y-%m-%d %H:%M:%S',  
-    handlers=[
+TEXT_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+log_counts = {}
+listener = None
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "ts": self.formatTime(record, DATE_FORMAT),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage()
+        }
+        sample_key = getattr(record, "sample_key", None)
+        if sample_key is not None:
+            entry["key"] = sample_key
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+class LogFilter(logging.Filter):
+    def __init__(self, mode=LOG_MODE, window=LOG_SAMPLE_WINDOW, burst=LOG_SAMPLE_BURST, max_keys=LOG_SAMPLE_KEYS):
+        super().__init__()
+        self.mode = mode
+        self.window = window
+        self.burst = burst
+        self.max_keys = max_keys
+        self.samples = {}
+
+    def filter(self, record):
+        keep = getattr(record, "log_keep", None)
+        if keep is None:
+            keep = record.log_keep = self.decide(record)
+        return keep
+
+    def decide(self, record):
+        log_counts[record.levelname] = log_counts.get(record.levelname, 0) + 1
+        if self.mode == "counters" and record.levelno < logging.CRITICAL:
+            return False
+        key = getattr(record, "sample_key", None)
+        if key is None:
+            return True
+        sample = self.samples.get(key)
+        if sample is None or record.created - sample[0] >= self.window:
+            if sample is not None and sample[2] and not record.args:
+                record.msg = f"{record.msg} ({sample[2]} similar messages suppressed)"
+            self.samples.pop(key, None)
+            sample = self.samples[key] = [record.created, 0, 0]
+            while len(self.samples) > self.max_keys:
+                del self.samples[next(iter(self.samples))]
+        if sample[1] < self.burst:
+            sample[1] += 1
+            return True
+        sample[2] += 1
+        log_counts["SUPPRESSED"] = log_counts.get("SUPPRESSED", 0) + 1
+        return False
+
+def build_handlers(log_file=LOG_FILE):
+    return [
         RotatingFileHandler(
-            "botlog.txt",
-            maxBytes=50000000,
-            backupCount=10
+            log_file,
+            maxBytes=LOG_MAX_BYTES,
+            backupCount=LOG_BACKUP_COUNT,
+            delay=True
         ),
         logging.StreamHandler()
     ]
-)
+
+def stop_logging():
+    global listener
+    if listener is not None:
+        listener.stop()
+        listener = None
+
+def configure_logging(mode=LOG_MODE, fmt=LOG_FORMAT, handlers=None, queued=True):
+    global listener
+    stop_logging()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+        handler.close()
+    formatter = JsonFormatter() if fmt == "json" else logging.Formatter(TEXT_FORMAT, datefmt=DATE_FORMAT)
+    handlers = handlers if handlers is not None else build_handlers()
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    if queued:
+        records = queue.SimpleQueue()
+        listener = QueueListener(records, *handlers, respect_handler_level=True)
+        listener.start()
+        handlers = [QueueHandler(records)]
+    log_filter = LogFilter(mode)
+    for handler in handlers:
+        handler.addFilter(log_filter)
+        root.addHandler(handler)
+    root.setLevel(logging.INFO)
+    return log_filter
+
+configure_logging()
+atexit.register(stop_logging)
 
 LOGGER = logging.getLogger(__name__)
\ No newline at end of file
@@ -0,0 +1,213 @@
+#Copyright @ISmartCoder
+#Updates Channel t.me/TheSmartDev
+import asyncio
+import time
+from contextlib import contextmanager
+from .logger import LOGGER, log_counts
+from .helper import METRICS_HOST, METRICS_PORT, METRICS_DUMP_INTERVAL
+
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+class Histogram:
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.sum += value
+        self.count += 1
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                return
+        self.counts[-1] += 1
+
+    def quantile(self, q):
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for i, bound in enumerate(self.buckets):
+            seen += self.counts[i]
+            if seen >= target:
+                return bound
+        return float("inf")
+
+METRIC_HELP = {
+    "command_animation_skipped_total": "Command animations skipped to save the chat's send budget",
+    "command_chat_cache_hits_total": "Chat titles served from the command cache",
+    "command_chat_cache_misses_total": "Chat titles fetched from Telegram for commands",
+    "command_rpc_total": "Telegram RPCs made while answering commands",
+    "command_seconds": "Time spent answering a command",
+    "commands_throttled_total": "Commands refused by the per-user or per-chat limits",
+    "commands_total": "Commands received",
+    "cycle_connections": "New portal connections opened in the last poll cycle",
+    "cycle_wire_bytes": "Portal bytes received in the last poll cycle",
+    "dedup_seconds": "Time spent deduplicating SMS",
+    "deferred_numbers": "Numbers waiting to be retried after a failed fetch",
+    "digest_buffered": "OTPs waiting in digest buffers",
+    "digest_messages_total": "Digest messages sent",
+    "digest_otps_total": "OTPs delivered inside digest messages",
+    "digest_singles_total": "OTPs sent as single messages in digest mode",
+    "http_connections_reused_total": "Portal requests served on a reused connection",
+    "http_connections_total": "Portal connections opened",
+    "http_decoded_bytes_total": "Portal response bytes after decompression",
+    "http_dns_cache_hits_total": "Portal DNS lookups served from cache",
+    "http_dns_lookups_total": "Portal DNS lookups",
+    "http_wire_bytes_total": "Portal response bytes on the wire",
+    "log_records_total": "Log records by level",
+    "numbers_deferred_total": "Number fetches deferred after a failure",
+    "open_breakers": "Ranges and numbers with an open circuit breaker",
+    "otp_delivery_age_seconds": "Time from first seeing an OTP to delivering it to Telegram",
+    "otp_unrouted_total": "OTPs that matched no subscription",
+    "outbox_write_seconds": "Time spent writing OTPs to the outbox",
+    "parse_seconds": "Time spent parsing portal pages",
+    "peer_cache_misses_total": "Telegram peers resolved over the network",
+    "poll_cycle_seconds": "Duration of a portal poll cycle",
+    "portal_auth_expired_total": "Portal sessions found expired",
+    "portal_csrf_seconds": "Time spent fetching a portal CSRF token",
+    "portal_fetch_seconds": "Time spent on portal requests",
+    "portal_login_seconds": "Time spent logging in to the portal",
+    "portal_logins_total": "Portal logins",
+    "portal_retries_total": "Portal requests retried",
+    "portal_throttled_total": "Portal requests answered with a throttling status",
+    "ranges_cooling_total": "Ranges put into cool-down",
+    "ranges_fetched_total": "Ranges fetched",
+    "ranges_skipped_total": "Ranges skipped because nothing changed",
+    "sms_cache_hits_total": "SMS already seen",
+    "sms_cache_misses_total": "SMS seen for the first time",
+    "startup_peer_resolve_seconds": "Time spent resolving chat peers at startup",
+    "telegram_coalesced_total": "Telegram sends merged into one already queued",
+    "telegram_floodwait_total": "Telegram FloodWait errors",
+    "telegram_send_seconds": "Time spent sending a Telegram message",
+    "telegram_sent_total": "Telegram messages sent",
+    "time_to_first_otp_seconds": "Time from the start of a poll cycle to its first OTP",
+}
+
+def label_key(labels):
+    return tuple(sorted(labels.items()))
+
+def escape_label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def format_labels(key, extra=None):
+    pairs = list(key) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{escape_label(value)}"' for name, value in pairs) + "}"
+
+def histogram_lines(name, key, buckets, counts, total, count):
+    lines = []
+    cumulative = 0
+    for bound, bucket_count in zip(buckets, counts):
+        cumulative += bucket_count
+        lines.append(f"{name}_bucket{format_labels(key, ('le', bound))} {cumulative}")
+    lines.append(f"{name}_bucket{format_labels(key, ('le', '+Inf'))} {count}")
+    lines.append(f"{name}_sum{format_labels(key)} {total}")
+    lines.append(f"{name}_count{format_labels(key)} {count}")
+    return lines
+
+class Metrics:
+    def __init__(self):
+        self.counters = {}
+        self.gauges = {}
+        self.histograms = {}
+        self.workers = {}
+
+    def inc(self, name, value=1, **labels):
+        key = (name, label_key(labels))
+        self.counters[key] = self.counters.get(key, 0) + value
+
+    def set_gauge(self, name, value, **labels):
+        self.gauges[(name, label_key(labels))] = value
+
+    def observe(self, name, value, **labels):
+        key = (name, label_key(labels))
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            histogram = self.histograms[key] = Histogram()
+        histogram.observe(value)
+
+    @contextmanager
+    def timer(self, name, **labels):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    def snapshot(self):
+        return {
+            "counters": [[name, key, value] for (name, key), value in self.counters.items()],
+            "gauges": [[name, key, value] for (name, key), value in self.gauges.items()],
+            "histograms": [
+                [name, key, histogram.buckets, histogram.counts, histogram.sum, histogram.count]
+                for (name, key), histogram in self.histograms.items()
+            ]
+        }
+
+    def merge_worker(self, label, snapshot):
+        self.workers[label] = snapshot
+
+    def render(self):
+        sources = [((), self.snapshot())]
+        sources.extend(((("worker", label),), snapshot) for label, snapshot in sorted(self.workers.items()))
+        families = {}
+        for extra, snapshot in sources:
+            for kind in ("counters", "gauges"):
+                for name, key, value in snapshot.get(kind, ()):
+                    families.setdefault((name, "counter" if kind == "counters" else "gauge"), []).append((tuple(map(tuple, key)) + extra, value))
+            for name, key, *histogram in snapshot.get("histograms", ()):
+                families.setdefault((name, "histogram"), []).append((tuple(map(tuple, key)) + extra, histogram))
+        for level, value in log_counts.items():
+            families.setdefault(("log_records_total", "counter"), []).append(((("level", level),), value))
+        lines = []
+        for (name, kind), samples in sorted(families.items()):
+            lines.append(f"# HELP {name} {METRIC_HELP.get(name, name.replace('_', ' '))}")
+            lines.append(f"# TYPE {name} {kind}")
+            for key, value in sorted(samples, key=lambda sample: str(sample[0])):
+                if kind == "histogram":
+                    lines.extend(histogram_lines(name, key, *value))
+                else:
+                    lines.append(f"{name}{format_labels(key)} {value}")
+        return "\n".join(lines) + "\n"
+
+    def summary(self):
+        summary = {}
+        for (name, key), value in sorted(self.counters.items()):
+            summary[f"{name}{format_labels(key)}"] = value
+        for level, value in sorted(log_counts.items()):
+            summary[f'log_records_total{{level="{level}"}}'] = value
+        for (name, key), histogram in sorted(self.histograms.items(), key=lambda item: item[0]):
+            if histogram.count:
+                summary[f"{name}{format_labels(key)}"] = (
+                    f"n={histogram.count} mean={histogram.sum / histogram.count:.3f}s "
+                    f"p50<={histogram.quantile(0.5)}s p95<={histogram.quantile(0.95)}s"
+                )
+        return summary
+
+METRICS = Metrics()
+
+async def start_metrics_server(host=METRICS_HOST, port=METRICS_PORT):
+    if not port:
+        return None
+    from aiohttp import web
+
+    async def handle_metrics(request):
+        return web.Response(text=METRICS.render(), content_type="text/plain", charset="utf-8")
+
+    app = web.Application()
+    app.router.add_get("/metrics", handle_metrics)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    LOGGER.info(f"Metrics endpoint listening on http://{host}:{port}/metrics")
+    return runner
+
+async def dump_metrics(interval=METRICS_DUMP_INTERVAL):
+    while interval:
+        await asyncio.sleep(interval)
+        for name, value in METRICS.summary().items():
+            LOGGER.info(f"[metrics] {name}: {value}")
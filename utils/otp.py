@@ -0,0 +1,207 @@
+#Copyright @ISmartCoder
+#Updates Channel t.me/TheSmartDev
+import re
+from .service import SERVICE_PATTERNS, SERVICE_PRIORITY
+
+NO_OTP = "No OTP found"
+UNKNOWN_SERVICE = "Unknown"
+KEYWORD = "keyword"
+HINT = "hint"
+KEYWORDS = ("verification code", "code", "otp", "pin", "passcode", "password", "token", "código", "codigo", "код", "kode", "mã")
+HINTS = ("verif", "one-time", "one time", "security", "login", "confirm")
+
+KEYWORD_GAP = re.compile(r"\W{0,3}(?:is\W{0,3}|:\s*|-\s*)?")
+NEAR_GAP = re.compile(r"\D{0,30}")
+TELEGRAM_GAP = re.compile(r":?\s*")
+YOUR_SUFFIX = re.compile(r"\W{0,3}(?:is|est|es|é|ist)\s+(?:your|the|votre|tu|seu|dein|ihr)\b")
+ALNUM_CODE = re.compile(r":?\s*([A-Za-z0-9]{4,8})\b")
+WORD = re.compile(r"\w")
+YEAR = re.compile(r"(?:19|20)\d\d")
+ESCAPED_CHAR = re.compile(r'\\([^0-9A-Za-z])')
+REGEX_META = re.compile(r'[\\()\[\]{}*+?.^$|]')
+
+def pattern_literals(pattern):
+    body = pattern[1:-1] if pattern.startswith('(') and pattern.endswith(')') else pattern
+    literals = []
+    for alternative in body.split('|'):
+        literal = ESCAPED_CHAR.sub(r'\1', alternative)
+        if not literal or REGEX_META.search(ESCAPED_CHAR.sub('', alternative)):
+            return None
+        literals.append(literal.lower())
+    return literals
+
+def literal_branches(literals):
+    tree = {}
+    for literal in literals:
+        node = tree
+        for char in literal:
+            node = node.setdefault(char, {})
+        node[""] = {}
+    branches = []
+    for char, child in sorted(tree.items()):
+        rest = "|".join(trie_branches(child))
+        branches.append(f"{re.escape(char)}(?=((?:{rest}){'?' if '' in child else ''}))")
+    return branches
+
+def trie_branches(node):
+    branches = []
+    for char, child in sorted(node.items()):
+        if not char:
+            continue
+        rest = trie_branches(child)
+        if not rest:
+            branches.append(re.escape(char))
+        elif len(rest) == 1 and "" not in child:
+            branches.append(re.escape(char) + rest[0])
+        else:
+            branches.append(f"{re.escape(char)}(?:{'|'.join(rest)}){'?' if '' in child else ''}")
+    return branches
+
+def build_scanner(patterns=SERVICE_PATTERNS, priority=SERVICE_PRIORITY):
+    order = list(patterns)
+    services = sorted(order, key=lambda service: (priority.get(service, len(order)), order.index(service)))
+    tokens = {}
+    groups = {}
+    for service in services:
+        literals = pattern_literals(patterns[service])
+        if literals is None:
+            groups[f"s{len(groups)}"] = service
+            continue
+        for literal in literals:
+            tokens.setdefault(literal, service)
+    for literal in KEYWORDS:
+        tokens.setdefault(literal, KEYWORD)
+    for literal in HINTS:
+        tokens.setdefault(literal, HINT)
+    alternatives = [rf"{digit}\d{{2,}}" for digit in "0123456789"] + literal_branches(tokens)
+    alternatives.extend(f"(?=(?P<{name}>(?i:{patterns[service]})))" for name, service in groups.items())
+    ranks = {service: rank for rank, service in enumerate(services)}
+    return re.compile("|".join(alternatives)), tokens, groups, ranks
+
+SCANNER, TOKENS, SERVICE_GROUPS, SERVICE_RANKS = build_scanner()
+
+def scan(lowered):
+    service = UNKNOWN_SERVICE
+    rank = len(SERVICE_RANKS)
+    hinted = False
+    runs = []
+    keywords = []
+    for match in SCANNER.finditer(lowered):
+        if match.lastindex is None:
+            runs.append(match.span())
+            continue
+        if match.lastgroup is not None:
+            kind = SERVICE_GROUPS[match.lastgroup]
+        else:
+            end = match.end(match.lastindex)
+            value = lowered[match.start():end]
+            kind = TOKENS[value]
+        if kind == KEYWORD:
+            keywords.append((match.start(), end, value))
+            hinted = True
+        elif kind == HINT:
+            hinted = True
+        elif SERVICE_RANKS[kind] < rank:
+            service, rank = kind, SERVICE_RANKS[kind]
+    return service, hinted, runs, keywords
+
+def classify_service(message):
+    return scan(message.lower())[0] if message else UNKNOWN_SERVICE
+
+def candidates(lowered, runs):
+    codes = []
+    for index, (start, end) in enumerate(runs):
+        if end - start == 3 and index + 1 < len(runs):
+            next_start, next_end = runs[index + 1]
+            if next_start == end + 1 and next_end - next_start == 3 and lowered[end] in "- ":
+                codes.append((start, next_end))
+                continue
+        if 4 <= end - start <= 8:
+            codes.append((start, end))
+    return codes
+
+def word_at(lowered, position):
+    return 0 <= position < len(lowered) and WORD.match(lowered, position) is not None
+
+def first_after(runs, codes, position):
+    for start, _ in runs:
+        if start >= position:
+            for code in codes:
+                if code[0] >= start:
+                    return code if code[0] == start else None
+            return None
+    return None
+
+def service_otp(service, lowered, runs, codes, keywords):
+    if service == "WhatsApp" or service == "Instagram":
+        separator = "-" if service == "WhatsApp" else " "
+        for start, end in codes:
+            if end - start == 7 and lowered[start + 3] == separator:
+                return lowered[start:end]
+    elif service == "Google" or service == "Facebook":
+        prefix = "g-" if service == "Google" else "fb-"
+        for start, end in runs:
+            if 4 <= end - start <= 8 and start >= len(prefix) and lowered.startswith(prefix, start - len(prefix)) and not word_at(lowered, start - len(prefix) - 1) and not word_at(lowered, end):
+                return lowered[start:end]
+        if service == "Facebook":
+            for start, end in runs:
+                if 5 <= end - start <= 8 and lowered[start - 1:start] != "+" and lowered.startswith(" is your", end):
+                    return lowered[start:end]
+    elif service == "Telegram":
+        for keyword_start, keyword_end, keyword in keywords:
+            if not keyword.endswith("code") or (keyword == "code" and word_at(lowered, keyword_start - 1)):
+                continue
+            for start, end in runs:
+                if start >= keyword_end and 5 <= end - start <= 6 and TELEGRAM_GAP.fullmatch(lowered, keyword_end, start) and not word_at(lowered, end):
+                    return lowered[start:end]
+    return None
+
+def generic_otp(text, lowered, runs, codes, keywords):
+    for _, keyword_end, _ in keywords:
+        code = first_after(runs, codes, keyword_end)
+        if code is not None and KEYWORD_GAP.fullmatch(lowered, keyword_end, code[0]):
+            return lowered[code[0]:code[1]]
+    for start, end in codes:
+        if lowered[start - 1:start] != "+" and YOUR_SUFFIX.match(lowered, end):
+            return lowered[start:end]
+    for _, keyword_end, _ in keywords:
+        code = first_after(runs, codes, keyword_end)
+        if code is None or not NEAR_GAP.fullmatch(lowered, keyword_end, code[0]):
+            continue
+        start, end = code
+        if lowered[start - 1:start] not in ("+", "/", ".", ":", "-") and lowered[end:end + 1] not in ("/", ".", ":"):
+            return lowered[start:end]
+    for _, keyword_end, keyword in keywords:
+        match = ALNUM_CODE.match(lowered, keyword_end) if keyword == "verification code" else None
+        if match is not None:
+            return (text if len(text) == len(lowered) else lowered)[match.start(1):match.end(1)]
+    return None
+
+def fallback_otp(lowered, codes):
+    for start, end in codes:
+        if end - start > 6 and lowered[start + 3] not in "- ":
+            continue
+        if lowered[start - 1:start] in ("+", "/", ".", ":", ",", "-") or word_at(lowered, start - 1) or word_at(lowered, end):
+            continue
+        if lowered[end:end + 1] in ("/", ".", ":", ",", "-") and lowered[end + 1:end + 2].isdigit():
+            continue
+        if YEAR.fullmatch(lowered, start, end):
+            continue
+        return lowered[start:end]
+    return None
+
+def analyze_message(text, service=None):
+    if not text:
+        return service or UNKNOWN_SERVICE, NO_OTP
+    lowered = text.lower()
+    found, hinted, runs, keywords = scan(lowered)
+    if found != UNKNOWN_SERVICE or service is None:
+        service = found
+    codes = candidates(lowered, runs)
+    otp = service_otp(service, lowered, runs, codes, keywords) or generic_otp(text, lowered, runs, codes, keywords)
+    if otp is None and (service != UNKNOWN_SERVICE or hinted):
+        otp = fallback_otp(lowered, codes)
+    return found, otp or NO_OTP
+
+def extract_otp(text, service=None):
+    return analyze_message(text, service)[1]
@@ -0,0 +1,71 @@
+#Copyright @ISmartCoder
+#Updates Channel t.me/TheSmartDev
+import sqlite3
+import time
+from .helper import OTP_HISTORY_FILE, OTP_DUPLICATE_WINDOW
+
+class OtpHistory:
+    def __init__(self, path=OTP_HISTORY_FILE, window=OTP_DUPLICATE_WINDOW):
+        self.path = path
+        self.window = window
+        self.conn = None
+
+    def open(self):
+        if self.conn is not None:
+            return
+        self.conn = sqlite3.connect(self.path, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS otp_history ("
+            "number TEXT NOT NULL, otp TEXT NOT NULL, message_id TEXT NOT NULL, timestamp REAL NOT NULL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_otp_history_lookup ON otp_history (number, otp, timestamp)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_otp_history_timestamp ON otp_history (timestamp)")
+        self.conn.commit()
+
+    def recent(self, numbers, since):
+        seen = {}
+        numbers = list(numbers)
+        for i in range(0, len(numbers), 500):
+            chunk = numbers[i:i + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self.conn.execute(
+                f"SELECT number, otp, message_id FROM otp_history WHERE timestamp >= ? AND number IN ({placeholders})",
+                [since, *chunk]
+            )
+            for number, otp, message_id in rows:
+                seen.setdefault((number, otp), set()).add(message_id)
+        return seen
+
+    def filter_new(self, sms_list):
+        if not sms_list:
+            return []
+        self.open()
+        now = time.time()
+        seen = self.recent({sms.number for sms in sms_list}, now - self.window)
+        fresh = []
+        for sms in sms_list:
+            message_ids = seen.setdefault((sms.number, sms.otp), set())
+            if message_ids - {sms.message_id}:
+                continue
+            message_ids.add(sms.message_id)
+            fresh.append(sms)
+        return fresh
+
+    def commit(self, sms_list):
+        if not sms_list:
+            return
+        self.open()
+        now = time.time()
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO otp_history (number, otp, message_id, timestamp) VALUES (?, ?, ?, ?)",
+                [(sms.number, sms.otp, sms.message_id, now) for sms in sms_list]
+            )
+            self.conn.execute("DELETE FROM otp_history WHERE timestamp < ?", (now - self.window,))
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
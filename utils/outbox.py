@@ -0,0 +1,86 @@
+#Copyright @ISmartCoder
+#Updates Channel t.me/TheSmartDev
+import json
+import sqlite3
+import time
+from .record import SmsRecord
+from .helper import OUTBOX_FILE, OUTBOX_RETENTION
+
+PENDING = "pending"
+SENT = "sent"
+FAILED = "failed"
+
+def outbox_key(message_id, chat_id):
+    return f"{message_id}:{chat_id}"
+
+class Outbox:
+    def __init__(self, path=OUTBOX_FILE, retention=OUTBOX_RETENTION):
+        self.path = path
+        self.retention = retention
+        self.conn = None
+        self.last_pruned = 0.0
+
+    def open(self):
+        if self.conn is not None:
+            return
+        self.conn = sqlite3.connect(self.path, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS outbox ("
+            "key TEXT PRIMARY KEY, chat_id INTEGER NOT NULL, message_id TEXT NOT NULL, payload TEXT NOT NULL, "
+            "state TEXT NOT NULL, attempts INTEGER NOT NULL DEFAULT 0, error TEXT, created REAL NOT NULL, updated REAL NOT NULL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_outbox_state ON outbox (state, created)")
+        self.conn.commit()
+
+    def enqueue(self, sms, chat_ids):
+        self.open()
+        now = time.time()
+        payload = json.dumps(sms.to_dict(), ensure_ascii=False)
+        keys = []
+        with self.conn:
+            for chat_id in chat_ids:
+                key = outbox_key(sms.message_id, chat_id)
+                cursor = self.conn.execute(
+                    "INSERT OR IGNORE INTO outbox (key, chat_id, message_id, payload, state, created, updated) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (key, chat_id, sms.message_id, payload, PENDING, now, now)
+                )
+                if cursor.rowcount:
+                    keys.append((chat_id, key))
+        self.maybe_prune(now)
+        return keys
+
+    def settle(self, key, state, attempts=0, error=None):
+        self.open()
+        with self.conn:
+            self.conn.execute(
+                "UPDATE outbox SET state = ?, attempts = ?, error = ?, updated = ? WHERE key = ?",
+                (state, attempts, error, time.time(), key)
+            )
+
+    def pending(self):
+        self.open()
+        rows = self.conn.execute(
+            "SELECT key, chat_id, payload FROM outbox WHERE state = ? ORDER BY created", (PENDING,)
+        )
+        return [(key, chat_id, SmsRecord.from_dict(json.loads(payload))) for key, chat_id, payload in rows]
+
+    def counts(self):
+        self.open()
+        return dict(self.conn.execute("SELECT state, COUNT(*) FROM outbox GROUP BY state"))
+
+    def maybe_prune(self, now=None):
+        now = now if now is not None else time.time()
+        if now - self.last_pruned < 3600:
+            return
+        self.last_pruned = now
+        with self.conn:
+            self.conn.execute(
+                "DELETE FROM outbox WHERE state != ? AND updated < ?", (PENDING, now - self.retention)
+            )
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
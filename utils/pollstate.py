@@ -0,0 +1,64 @@
+#Copyright @ISmartCoder
+#Updates Channel t.me/TheSmartDev
+import json
+import os
+from .logger import LOGGER
+
+class PollState:
+    def __init__(self, path=None):
+        self.path = path
+        self.range_counts = {}
+        self.last_seen = {}
+        self.observed = {}
+        self.checkpoint = {}
+
+    def load(self):
+        if not (self.path and os.path.exists(self.path)):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.range_counts = dict(data.get("range_counts", {}))
+            self.last_seen = dict(data.get("last_seen", {}))
+            LOGGER.info(f"Restored poll state for {len(self.range_counts)} ranges from {self.path}")
+        except Exception as e:
+            LOGGER.warning(f"Could not restore poll state from {self.path}: {e}")
+
+    def save(self, exclude=()):
+        if not self.path:
+            return
+        range_counts = {name: count for name, count in self.range_counts.items() if name not in exclude}
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({"range_counts": range_counts, "last_seen": self.last_seen}, f)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            LOGGER.warning(f"Could not persist poll state: {e}")
+
+    def begin_cycle(self):
+        self.checkpoint = dict(self.range_counts)
+
+    def rollback(self):
+        self.range_counts = dict(self.checkpoint)
+
+    def forget(self, range_names):
+        for range_name in range_names:
+            self.range_counts.pop(range_name, None)
+
+    def range_changed(self, range_name, count):
+        return self.range_counts.get(range_name) != count
+
+    def commit_range(self, range_name, count):
+        self.range_counts[range_name] = count
+
+    def seen(self, number, message_id):
+        return self.last_seen.get(number) == message_id
+
+    def mark_seen(self, number, message_id):
+        self.last_seen[number] = message_id
+
+    def observe(self, ranges):
+        self.observed = dict(ranges)
+        for range_name in set(self.range_counts) - set(self.observed):
+            del self.range_counts[range_name]
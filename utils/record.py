@@ -0,0 +1,43 @@
+#Copyright @ISmartCoder
+#Updates Channel t.me/TheSmartDev
+import sys
+import time
+
+def intern(value):
+    return sys.intern(value) if type(value) is str else value
+
+class SmsRecord:
+    __slots__ = ("range", "count", "country", "country_emoji", "service", "number", "otp", "full_message", "message_id", "first_seen")
+
+    def __init__(self, range_name, count, country, country_emoji, service, number, otp, full_message, message_id, first_seen=None):
+        self.range = intern(range_name)
+        self.count = count
+        self.country = intern(country)
+        self.country_emoji = intern(country_emoji)
+        self.service = intern(service)
+        self.number = intern(number)
+        self.otp = otp
+        self.full_message = full_message
+        self.message_id = message_id
+        self.first_seen = float(first_seen) if first_seen is not None else time.time()
+
+    def to_dict(self):
+        return {field: getattr(self, field) for field in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            data.get("range", ""),
+            data.get("count", 0),
+            data.get("country", "Unknown"),
+            data.get("country_emoji", ""),
+            data.get("service", "Unknown"),
+            data.get("number", ""),
+            data.get("otp", "No OTP found"),
+            data.get("full_message", "No message available"),
+            data.get("message_id", ""),
+            data.get("first_seen")
+        )
+
+    def __repr__(self):
+        return f"SmsRecord({self.number!r}, {self.service!r}, {self.otp!r}, {self.message_id!r})"
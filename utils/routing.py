@@ -0,0 +1,104 @@
+#Copyright @ISmartCoder
+#Updates Channel t.me/TheSmartDev
+import json
+import os
+from .logger import LOGGER
+from .helper import SUBSCRIPTIONS_FILE
+
+WILDCARD = "*"
+
+def parse_chat_id(value):
+    return int(value) if value.lstrip("-").isdigit() else value
+
+def normalize(value):
+    value = (value or "").strip().casefold()
+    return value or WILDCARD
+
+class SubscriptionIndex:
+    def __init__(self, path=SUBSCRIPTIONS_FILE, default_chats=()):
+        self.path = path
+        self.default_chats = list(default_chats)
+        self.subscriptions = {}
+        self.index = {}
+        self.routes = {}
+        self.loaded = False
+
+    def load(self):
+        if self.loaded:
+            return
+        self.loaded = True
+        self.subscriptions = {chat_id: {(WILDCARD, WILDCARD)} for chat_id in self.default_chats}
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                self.subscriptions.update({
+                    parse_chat_id(chat_id): {(normalize(country), normalize(service)) for country, service in keys}
+                    for chat_id, keys in data.items()
+                })
+                added = [chat_id for chat_id in self.default_chats if str(chat_id) not in data]
+                if added:
+                    LOGGER.info(f"Subscribed new default chats {added} to all OTPs")
+            except Exception as e:
+                LOGGER.error(f"Could not load subscriptions from {self.path}, routing to all chats: {e}")
+        self.rebuild()
+        LOGGER.info(f"Loaded {sum(len(keys) for keys in self.subscriptions.values())} subscriptions for {sum(1 for keys in self.subscriptions.values() if keys)} chats")
+
+    def save(self):
+        data = {
+            str(chat_id): sorted([country, service] for country, service in keys)
+            for chat_id, keys in self.subscriptions.items()
+        }
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            LOGGER.error(f"Could not save subscriptions to {self.path}: {e}")
+
+    def rebuild(self):
+        index = {}
+        for chat_id, keys in self.subscriptions.items():
+            for key in keys:
+                index.setdefault(key, set()).add(chat_id)
+        self.index = index
+        self.routes = {}
+
+    def subscribe(self, chat_id, country=WILDCARD, service=WILDCARD):
+        key = (normalize(country), normalize(service))
+        keys = self.subscriptions.setdefault(chat_id, set())
+        if key in keys:
+            return False
+        keys.add(key)
+        self.rebuild()
+        self.save()
+        return True
+
+    def unsubscribe(self, chat_id, country=None, service=None):
+        keys = self.subscriptions.get(chat_id)
+        if not keys:
+            return 0
+        if country is None and service is None:
+            removed = set(keys)
+        else:
+            removed = keys & {(normalize(country), normalize(service))}
+        keys -= removed
+        if removed:
+            self.rebuild()
+            self.save()
+        return len(removed)
+
+    def chats_for(self, country, service):
+        key = (normalize(country), normalize(service))
+        chats = self.routes.get(key)
+        if chats is None:
+            country, service = key
+            matched = set()
+            for candidate in ((country, service), (country, WILDCARD), (WILDCARD, service), (WILDCARD, WILDCARD)):
+                matched |= self.index.get(candidate, set())
+            chats = self.routes[key] = tuple(sorted(matched, key=str))
+        return chats
+
+    def describe(self, chat_id):
+        return sorted(self.subscriptions.get(chat_id, ()))
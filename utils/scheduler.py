@@ -0,0 +1,79 @@
+#Copyright @ISmartCoder
+#Updates Channel t.me/TheSmartDev
+import random
+import time
+from .helper import POLL_INTERVAL, POLL_MIN_INTERVAL, POLL_MAX_INTERVAL, POLL_HOT_WINDOW, POLL_ERROR_DELAY, POLL_MAX_ERROR_DELAY
+
+class PollScheduler:
+    def __init__(self, interval=POLL_INTERVAL, min_interval=POLL_MIN_INTERVAL, max_interval=POLL_MAX_INTERVAL,
+                 hot_window=POLL_HOT_WINDOW, error_delay=POLL_ERROR_DELAY, max_error_delay=POLL_MAX_ERROR_DELAY):
+        self.interval = interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.hot_window = hot_window
+        self.error_delay = error_delay
+        self.max_error_delay = max_error_delay
+        self.rate = 0.0
+        self.counts = {}
+        self.last_change = {}
+        self.last_poll = None
+        self.failures = 0
+
+    def observe(self, range_counts, now=None):
+        now = now if now is not None else time.monotonic()
+        arrivals = 0
+        for range_name, count in range_counts.items():
+            count = int(count) if str(count).isdigit() else 0
+            previous = self.counts.get(range_name)
+            if previous is not None and count != previous:
+                arrivals += max(count - previous, 1)
+                self.last_change[range_name] = now
+            self.counts[range_name] = count
+        for range_name in set(self.counts) - set(range_counts):
+            del self.counts[range_name]
+            self.last_change.pop(range_name, None)
+        if self.last_poll is not None:
+            elapsed = max(now - self.last_poll, 1e-3)
+            self.rate = 0.7 * self.rate + 0.3 * (arrivals / elapsed)
+        self.last_poll = now
+        self.failures = 0
+        self.interval = self.compute_interval(now)
+        return self.interval
+
+    def record_failure(self):
+        self.failures += 1
+
+    def range_interval(self, range_name, now=None):
+        now = now if now is not None else time.monotonic()
+        changed = self.last_change.get(range_name)
+        if changed is None:
+            return self.max_interval
+        age = now - changed
+        if age <= self.hot_window:
+            return self.min_interval
+        scale = min((age - self.hot_window) / (self.hot_window * 4), 1.0)
+        return self.min_interval + scale * (self.max_interval - self.min_interval)
+
+    def compute_interval(self, now):
+        hottest = min((self.range_interval(range_name, now) for range_name in self.counts), default=self.max_interval)
+        if self.rate > 0:
+            hottest = min(hottest, 1 / self.rate)
+        return max(self.min_interval, min(hottest, self.max_interval))
+
+    def next_delay(self):
+        if self.failures:
+            delay = min(self.error_delay * 2 ** (self.failures - 1), self.max_error_delay)
+            return delay / 2 + random.uniform(0, delay / 2)
+        return min(self.interval * random.uniform(0.9, 1.1), self.max_interval)
+
+    def schedule(self, now=None):
+        now = now if now is not None else time.monotonic()
+        return {
+            "interval": round(self.interval, 2),
+            "arrival_rate": round(self.rate, 3),
+            "failures": self.failures,
+            "ranges": {
+                range_name: round(self.range_interval(range_name, now), 2)
+                for range_name in sorted(self.counts, key=lambda name: self.range_interval(name, now))
+            }
+        }
@@ -17,4 +17,6 @@ SERVICE_PATTERNS = {
     "TikTok": r"(tiktok)",
     "LinkedIn": r"(linkedin)",
     "Spotify": r"(spotify)"
-}
\ No newline at end of file
+}
+
+SERVICE_PRIORITY = {}
\ No newline at end of file
@@ -0,0 +1,64 @@
+#Copyright @ISmartCoder
+#Updates Channel t.me/TheSmartDev
+import json
+import os
+import time
+from .logger import LOGGER
+from .helper import SESSION_COOKIE_FILE, SESSION_TOKEN_FILE, SESSION_SAVE_INTERVAL
+
+AUTH_FAILURE_STATUSES = (401, 419)
+
+class AuthExpired(Exception):
+    pass
+
+def is_auth_failure(response):
+    if response.status in AUTH_FAILURE_STATUSES:
+        return True
+    return bool(response.history) and response.url.path.rstrip('/').endswith('/login')
+
+class PortalSession:
+    def __init__(self, cookie_path=SESSION_COOKIE_FILE, token_path=SESSION_TOKEN_FILE, save_interval=SESSION_SAVE_INTERVAL):
+        self.cookie_path = cookie_path
+        self.token_path = token_path
+        self.save_interval = save_interval
+        self.token = None
+        self.last_saved = 0.0
+
+    def restore(self, session):
+        if not (os.path.exists(self.cookie_path) and os.path.exists(self.token_path)):
+            return False
+        try:
+            session.cookie_jar.load(self.cookie_path)
+            with open(self.token_path, 'r', encoding='utf-8') as f:
+                self.token = json.load(f).get("token")
+        except Exception as e:
+            LOGGER.warning(f"Could not restore portal session: {e}")
+            self.token = None
+            return False
+        if self.token:
+            LOGGER.info("Restored portal session from disk")
+        return bool(self.token)
+
+    def update(self, session, token):
+        self.token = token
+        self.save(session)
+
+    def invalidate(self):
+        if self.token:
+            LOGGER.warning("Portal session expired, token invalidated")
+        self.token = None
+
+    def save(self, session):
+        try:
+            session.cookie_jar.save(self.cookie_path)
+            tmp_path = f"{self.token_path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({"token": self.token, "saved_at": int(time.time())}, f)
+            os.replace(tmp_path, self.token_path)
+            self.last_saved = time.monotonic()
+        except Exception as e:
+            LOGGER.warning(f"Could not persist portal session: {e}")
+
+    def maybe_save(self, session):
+        if self.token and time.monotonic() - self.last_saved >= self.save_interval:
+            self.save(session)
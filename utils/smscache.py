@@ -0,0 +1,88 @@
+#Copyright @ISmartCoder
+#Updates Channel t.me/TheSmartDev
+import json
+import os
+import time
+from datetime import datetime
+from .logger import LOGGER
+from .helper import SMS_CACHE_TTL, SMS_CACHE_COMPACT_EVERY
+
+class SmsCache:
+    def __init__(self, path, ttl=SMS_CACHE_TTL, compact_every=SMS_CACHE_COMPACT_EVERY):
+        self.path = path
+        self.ttl = ttl
+        self.compact_every = compact_every
+        self.entries = {}
+        self.journal = None
+        self.appends = 0
+
+    def __contains__(self, message_id):
+        return message_id in self.entries
+
+    def __len__(self):
+        return len(self.entries)
+
+    def load(self):
+        entries = {}
+        if os.path.exists(self.path):
+            with open(self.path, 'r', encoding='utf-8') as f:
+                text = f.read()
+            try:
+                legacy = json.loads(text) if text.lstrip().startswith('{') else None
+            except json.JSONDecodeError:
+                legacy = None
+            if isinstance(legacy, dict) and "id" not in legacy:
+                for message_id, value in legacy.items():
+                    try:
+                        entries[message_id] = int(datetime.fromisoformat(value["timestamp"]).timestamp())
+                    except (KeyError, TypeError, ValueError):
+                        entries[message_id] = int(time.time())
+            else:
+                for line in text.splitlines():
+                    try:
+                        record = json.loads(line)
+                        entries[record["id"]] = int(record["ts"])
+                    except (json.JSONDecodeError, KeyError, TypeError, ValueError):
+                        continue
+        self.entries = dict(sorted(entries.items(), key=lambda item: item[1]))
+        self.compact()
+        LOGGER.info(f"Loaded {len(self.entries)} cached SMS ids from {self.path}")
+
+    def add(self, message_id, timestamp=None):
+        if message_id in self.entries:
+            return
+        timestamp = int(timestamp if timestamp is not None else time.time())
+        self.entries[message_id] = timestamp
+        if self.journal is None:
+            self.journal = open(self.path, 'a', encoding='utf-8')
+        self.journal.write(json.dumps({"id": message_id, "ts": timestamp}, ensure_ascii=False) + "\n")
+        self.journal.flush()
+        self.appends += 1
+        if self.appends >= self.compact_every:
+            self.compact()
+
+    def evict(self, now=None):
+        cutoff = (now if now is not None else time.time()) - self.ttl
+        evicted = 0
+        while self.entries:
+            message_id = next(iter(self.entries))
+            if self.entries[message_id] >= cutoff:
+                break
+            del self.entries[message_id]
+            evicted += 1
+        return evicted
+
+    def compact(self):
+        self.evict()
+        self.close()
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for message_id, timestamp in self.entries.items():
+                f.write(json.dumps({"id": message_id, "ts": timestamp}, ensure_ascii=False) + "\n")
+        os.replace(tmp_path, self.path)
+        self.appends = 0
+
+    def close(self):
+        if self.journal is not None:
+            self.journal.close()
+            self.journal = None
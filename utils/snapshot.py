@@ -0,0 +1,47 @@
+#Copyright @ISmartCoder
+#Updates Channel t.me/TheSmartDev
+import json
+import os
+from .logger import LOGGER
+from .helper import WARM_CACHE_FILE
+
+def load_snapshot(path=WARM_CACHE_FILE):
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception as e:
+        LOGGER.warning(f"Could not read warm cache snapshot {path}: {e}")
+        return {}
+
+def save_snapshot(data, path=WARM_CACHE_FILE):
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except Exception as e:
+        LOGGER.warning(f"Could not write warm cache snapshot {path}: {e}")
+
+def dump_peers(peers):
+    dumped = {}
+    for chat_id, peer in peers.items():
+        to_dict = getattr(peer, "to_dict", None)
+        if to_dict is not None:
+            dumped[str(chat_id)] = to_dict()
+    return dumped
+
+def restore_peers(data):
+    from telethon.tl import types
+    peers = {}
+    for chat_id, fields in (data or {}).items():
+        fields = dict(fields)
+        peer_type = getattr(types, fields.pop("_", ""), None)
+        if peer_type is None:
+            continue
+        try:
+            peers[int(chat_id)] = peer_type(**fields)
+        except (TypeError, ValueError):
+            continue
+    return peers
@@ -0,0 +1,100 @@
+#Copyright @ISmartCoder
+#Updates Channel t.me/TheSmartDev
+import ssl
+import zlib
+import aiohttp
+from .metrics import METRICS
+from .helper import HTTP_POOL_LIMIT, HTTP_POOL_LIMIT_PER_HOST, HTTP_KEEPALIVE_TIMEOUT, HTTP_DNS_TTL, HTTP_READ_CHUNK
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import certifi
+except ImportError:
+    certifi = None
+
+ACCEPT_ENCODING = "br, gzip, deflate" if brotli else "gzip, deflate"
+transport_stats = {"connections": 0, "reused": 0, "dns_lookups": 0, "wire_bytes": 0, "decoded_bytes": 0}
+ssl_context = None
+
+def get_ssl_context():
+    global ssl_context
+    if ssl_context is None:
+        ssl_context = ssl.create_default_context(cafile=certifi.where() if certifi else None)
+    return ssl_context
+
+async def on_connection_create_end(session, context, params):
+    transport_stats["connections"] += 1
+    METRICS.inc("http_connections_total")
+
+async def on_connection_reuseconn(session, context, params):
+    transport_stats["reused"] += 1
+    METRICS.inc("http_connections_reused_total")
+
+async def on_dns_resolvehost_end(session, context, params):
+    transport_stats["dns_lookups"] += 1
+    METRICS.inc("http_dns_lookups_total")
+
+async def on_dns_cache_hit(session, context, params):
+    METRICS.inc("http_dns_cache_hits_total")
+
+def build_trace_config():
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_connection_create_end.append(on_connection_create_end)
+    trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+    trace_config.on_dns_resolvehost_end.append(on_dns_resolvehost_end)
+    trace_config.on_dns_cache_hit.append(on_dns_cache_hit)
+    return trace_config
+
+def create_session():
+    connector = aiohttp.TCPConnector(
+        limit=HTTP_POOL_LIMIT,
+        limit_per_host=HTTP_POOL_LIMIT_PER_HOST,
+        keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+        ttl_dns_cache=HTTP_DNS_TTL,
+        use_dns_cache=True,
+        ssl=get_ssl_context()
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        trace_configs=[build_trace_config()],
+        auto_decompress=False,
+        headers={"Accept-Encoding": ACCEPT_ENCODING}
+    )
+
+def get_decompressor(content_encoding):
+    content_encoding = content_encoding.strip().lower()
+    if content_encoding == "gzip":
+        return zlib.decompressobj(16 + zlib.MAX_WBITS)
+    if content_encoding == "deflate":
+        return zlib.decompressobj()
+    if content_encoding == "br" and brotli:
+        return brotli.Decompressor()
+    return None
+
+def decompress_chunk(decompressor, chunk):
+    if hasattr(decompressor, "process"):
+        return decompressor.process(chunk)
+    return decompressor.decompress(chunk)
+
+async def read_text(response):
+    content_encoding = response.headers.get('Content-Encoding', '')
+    decompressor = get_decompressor(content_encoding)
+    if decompressor is None and content_encoding.strip().lower() not in ("", "identity"):
+        raise ValueError(f"Unsupported Content-Encoding: {content_encoding}")
+    parts = []
+    wire_bytes = 0
+    async for chunk in response.content.iter_chunked(HTTP_READ_CHUNK):
+        wire_bytes += len(chunk)
+        parts.append(decompress_chunk(decompressor, chunk) if decompressor else chunk)
+    if decompressor is not None and hasattr(decompressor, "flush"):
+        parts.append(decompressor.flush())
+    body = b"".join(parts)
+    transport_stats["wire_bytes"] += wire_bytes
+    transport_stats["decoded_bytes"] += len(body)
+    METRICS.inc("http_wire_bytes_total", wire_bytes)
+    METRICS.inc("http_decoded_bytes_total", len(body))
+    return body.decode(response.charset or 'utf-8', errors='replace')